@@ -12,12 +12,49 @@ class Settings(BaseSettings):
     feed_target_items_per_category: int = 3
     feed_max_items_per_category: int = 5
     feed_max_items_total: int = 30
+    feed_candidates_per_category: int = 40
+    feed_personalization_strength: float = 1.0
     ingestion_lookback_hours: int = 48
+    ingestion_fetch_concurrency: int = 16
+    ingestion_fetch_per_host: int = 2
+    ingestion_fetch_timeout_seconds: float = 10.0
+    ingestion_use_fetch_queue: bool = False
+    ingestion_pipeline_queue_size: int = 4
+    source_fetch_interval_minutes: int = 30
+    source_fetch_claim_batch: int = 8
+    source_fetch_visibility_timeout_seconds: int = 300
+    source_fetch_retry_max_minutes: int = 30
+    source_fetch_idle_sleep_seconds: float = 5.0
+    source_fetch_queue_sync_seconds: float = 300.0
     title_similarity_threshold: float = 0.85
+    title_dedupe_window_items: int = 500
+    title_dedupe_window_hours: int = 0
     deepl_api_key: str = ""
     deepl_api_url: str = "https://api-free.deepl.com/v2/translate"
     deepl_timeout_seconds: float = 6.0
     deepl_retries: int = 1
+    deepl_batch_size: int = 50
+    deepl_rate_limit_per_second: float = 2.0
+    deepl_rate_limit_burst: int = 4
+    deepl_breaker_failure_threshold: int = 5
+    deepl_breaker_cooldown_seconds: float = 300.0
+    translation_enrichment_interval_seconds: int = 60
+    translation_enrichment_batch_limit: int = 500
+    translation_worker_concurrency: int = 2
+    translation_max_attempts: int = 6
+    translation_retry_backoff_seconds: int = 300
+    keyword_workers: int = 2
+    keyword_chunk_size: int = 32
+    keyword_backfill_chunk_size: int = 200
+    feed_context_ttl_seconds: int = 60
+    event_buffer_max_size: int = 10000
+    event_buffer_flush_size: int = 500
+    event_buffer_flush_interval_seconds: float = 2.0
+    event_buffer_write_attempts: int = 4
+    event_buffer_retry_backoff_seconds: float = 0.5
+    rollup_interval_minutes: int = 10
+    rollup_settle_seconds: int = 60
+    scheduler_leader_heartbeat_seconds: int = 30
     cors_allowed_origins: str = ""
     admin_token: str = ""
 
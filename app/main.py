@@ -15,9 +15,13 @@ from app.routers.feedback import router as feedback_router
 from app.routers.feeds import router as feeds_router
 from app.routers.health import router as health_router
 from app.security import require_admin_token
+from app.services.event_buffer import event_buffer
+from app.services.enrichment import run_translation_enrichment
 from app.services.feed_builder import generate_feed_for_slot
 from app.services.ingestion import run_ingestion
-from app.services.seeds import apply_schema_upgrades, sync_seed_sources
+from app.services.keywords import shutdown_keyword_pool
+from app.services.migrations import run_migrations
+from app.services.seeds import sync_seed_sources
 from app.tasks import start_scheduler, stop_scheduler
 
 app = FastAPI(title=settings.app_name)
@@ -44,15 +48,18 @@ def on_startup():
     else:
         raise RuntimeError("database_not_ready")
 
+    run_migrations(engine)
     with SessionLocal() as db:
-        apply_schema_upgrades(db)
         sync_seed_sources(db)
+    event_buffer.start()
     start_scheduler()
 
 
 @app.on_event("shutdown")
 def on_shutdown():
     stop_scheduler()
+    event_buffer.stop()
+    shutdown_keyword_pool()
 
 
 @app.post("/admin/run-ingestion")
@@ -61,6 +68,12 @@ def admin_run_ingestion(_: None = Depends(require_admin_token)):
         return run_ingestion(db)
 
 
+@app.post("/admin/run-translation")
+def admin_run_translation(_: None = Depends(require_admin_token)):
+    with SessionLocal() as db:
+        return run_translation_enrichment(db)
+
+
 @app.post("/admin/generate-feed/{slot}")
 def admin_generate_feed(slot: str, _: None = Depends(require_admin_token)):
     slot_l = slot.lower()
@@ -68,7 +81,7 @@ def admin_generate_feed(slot: str, _: None = Depends(require_admin_token)):
         return {"error": "invalid_slot", "allowed": ["am", "pm"]}
     slot_t = SlotType.AM if slot_l == "am" else SlotType.PM
     with SessionLocal() as db:
-        feed_id = generate_feed_for_slot(db, slot_t)
+        feed_id = generate_feed_for_slot(db, slot_t, force=True)
     return {"feed_id": feed_id, "slot": slot_t.value}
 
 
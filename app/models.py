@@ -1,7 +1,7 @@
 from datetime import UTC, datetime
 from enum import Enum
 
-from sqlalchemy import Date, DateTime, Enum as SQLEnum, Float, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import JSON, Date, DateTime, Enum as SQLEnum, Float, ForeignKey, Integer, String, Text, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db import Base
@@ -35,6 +35,24 @@ class Source(Base):
     enabled: Mapped[bool] = mapped_column(default=True, nullable=False)
     weight: Mapped[float] = mapped_column(Float, default=1.0, nullable=False)
     last_fetched_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    etag: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+
+class SourceFetchQueue(Base):
+    """One row per enabled source; fetch workers claim due rows with SKIP LOCKED."""
+
+    __tablename__ = "source_fetch_queue"
+
+    source_id: Mapped[int] = mapped_column(ForeignKey("sources.id"), primary_key=True)
+    next_run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    locked_by: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    locked_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_status: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False)
 
 
 class Item(Base):
@@ -44,8 +62,11 @@ class Item(Base):
     source_id: Mapped[int] = mapped_column(ForeignKey("sources.id"), nullable=False)
     canonical_url: Mapped[str] = mapped_column(String(1024), nullable=False, unique=True)
     url: Mapped[str] = mapped_column(String(1024), nullable=False)
+    domain: Mapped[str | None] = mapped_column(String(255), nullable=True)
     title: Mapped[str] = mapped_column(String(512), nullable=False)
     translated_title_ko: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    translation_attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    translation_retry_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False)
     language: Mapped[str] = mapped_column(String(8), default="en", nullable=False)
@@ -74,6 +95,8 @@ class Feed(Base):
     feed_date: Mapped[datetime.date] = mapped_column(Date, nullable=False)
     slot: Mapped[SlotType] = mapped_column(SQLEnum(SlotType), nullable=False)
     generated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False)
+    snapshot: Mapped[list | None] = mapped_column(JSON, nullable=True)
+    input_fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
 
 class FeedItem(Base):
@@ -99,6 +122,22 @@ class Feedback(Base):
     category: Mapped[str | None] = mapped_column(String(64), nullable=True)
     feed_id: Mapped[int | None] = mapped_column(ForeignKey("feeds.id"), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False)
+    # Set by the database at insert; rollup watermarks settle on this, not on created_at.
+    inserted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class ItemFeedbackState(Base):
+    """Latest curation and preference action per item, maintained on every feedback write."""
+
+    __tablename__ = "item_feedback_state"
+
+    item_id: Mapped[int] = mapped_column(ForeignKey("items.id"), primary_key=True)
+    curation_action: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    curation_feedback_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    curation_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    preference_action: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    preference_feedback_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False)
 
 
 class ItemEventType(str, Enum):
@@ -118,6 +157,52 @@ class ItemEvent(Base):
     category: Mapped[str | None] = mapped_column(String(64), nullable=True)
     feed_id: Mapped[int | None] = mapped_column(ForeignKey("feeds.id"), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False)
+    # Set by the database at insert; rollup watermarks settle on this, not on created_at.
+    inserted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class DailyEventRollup(Base):
+    """Item event counts per local day; NULL context values are stored as '' / 0 so they can be keys."""
+
+    __tablename__ = "daily_event_rollups"
+
+    local_date: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    slot: Mapped[str] = mapped_column(String(8), primary_key=True, default="")
+    category: Mapped[str] = mapped_column(String(64), primary_key=True, default="")
+    source_id: Mapped[int] = mapped_column(Integer, primary_key=True, default=0)
+    event_type: Mapped[str] = mapped_column(String(32), primary_key=True)
+    event_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class DailyFeedOpen(Base):
+    """Feeds that received at least one impression on a local day."""
+
+    __tablename__ = "daily_feed_opens"
+
+    local_date: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    feed_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+
+class KeywordFeedbackDaily(Base):
+    """Liked/disliked feedback per (local day, keyword, item), pre-joined with item_keywords."""
+
+    __tablename__ = "keyword_feedback_daily"
+
+    local_date: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    keyword: Mapped[str] = mapped_column(String(128), primary_key=True)
+    item_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    liked_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    disliked_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class RollupWatermark(Base):
+    """Highest source row id already folded into a rollup."""
+
+    __tablename__ = "rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    last_id: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False)
 
 
 class Job(Base):
@@ -129,3 +214,13 @@ class Job(Base):
     ended_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     status: Mapped[str] = mapped_column(String(40), nullable=False)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    checkpoint_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    progress: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+
+
+class TranslationCache(Base):
+    __tablename__ = "translation_cache"
+
+    title_key: Mapped[str] = mapped_column(String(128), primary_key=True)
+    translated_text: Mapped[str] = mapped_column(String(512), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False)
@@ -1,17 +1,18 @@
 from datetime import UTC, date, datetime, time, timedelta
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import case, cast, Float as SAFloat, func, select, text
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 
 from app.config import settings
 from app.db import get_db
-from app.models import Feedback, Feed, Item, ItemEvent, ItemEventType, ItemKeyword
-from app.schemas import BackfillResultOut, KeywordSentimentItem, KeywordSentimentsOut, MetricsOut
+from app.models import Feed, Job
+from app.schemas import BackfillJobOut, KeywordSentimentItem, KeywordSentimentsOut, MetricsOut
 from app.security import require_admin_token
-from app.services.keywords import build_keyword_text, extract_keywords
+from app.services.backfill import KEYWORD_BACKFILL_JOB, run_keyword_backfill, start_keyword_backfill
+from app.services.rollups import event_metrics, keyword_sentiment_rows
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 APP_TZ = ZoneInfo(settings.app_timezone)
@@ -55,24 +56,10 @@ def get_metrics(
 ):
     start_dt, end_dt, from_date, to_date = _window_or_400(date_from, date_to)
 
-    impressions = db.execute(
-        select(func.count())
-        .select_from(ItemEvent)
-        .where(
-            ItemEvent.event_type == ItemEventType.IMPRESSION.value,
-            ItemEvent.created_at >= start_dt,
-            ItemEvent.created_at < end_dt,
-        )
-    ).scalar_one()
-    clicks = db.execute(
-        select(func.count())
-        .select_from(ItemEvent)
-        .where(
-            ItemEvent.event_type == ItemEventType.CLICK.value,
-            ItemEvent.created_at >= start_dt,
-            ItemEvent.created_at < end_dt,
-        )
-    ).scalar_one()
+    events = event_metrics(db, start_dt, end_dt, from_date, to_date)
+    impressions = events["impressions"]
+    clicks = events["clicks"]
+    opened_slots = events["opened_slots"]
     generated_slots = db.execute(
         select(func.count())
         .select_from(Feed)
@@ -81,15 +68,6 @@ def get_metrics(
             Feed.generated_at < end_dt,
         )
     ).scalar_one()
-    opened_slots = db.execute(
-        select(func.count(func.distinct(ItemEvent.feed_id)))
-        .where(
-            ItemEvent.event_type == ItemEventType.IMPRESSION.value,
-            ItemEvent.feed_id.is_not(None),
-            ItemEvent.created_at >= start_dt,
-            ItemEvent.created_at < end_dt,
-        )
-    ).scalar_one()
 
     ctr = (clicks / impressions) if impressions > 0 else 0.0
     slot_open_rate = (opened_slots / generated_slots) if generated_slots > 0 else 0.0
@@ -116,32 +94,7 @@ def get_keyword_sentiments(
 ):
     start_dt, end_dt, from_date, to_date = _window_or_400(date_from, date_to)
 
-    liked_count = func.count(case((Feedback.action == "liked", 1)))
-    disliked_count = func.count(case((Feedback.action == "disliked", 1)))
-    total_feedback = func.count()
-    total_items = func.count(func.distinct(ItemKeyword.item_id))
-
-    stmt = (
-        select(
-            ItemKeyword.keyword,
-            liked_count.label("liked_count"),
-            disliked_count.label("disliked_count"),
-            total_items.label("total_items"),
-            total_feedback.label("total_feedback"),
-        )
-        .join(Feedback, Feedback.item_id == ItemKeyword.item_id)
-        .where(
-            Feedback.action.in_(["liked", "disliked"]),
-            Feedback.created_at >= start_dt,
-            Feedback.created_at < end_dt,
-        )
-        .group_by(ItemKeyword.keyword)
-        .having(total_feedback >= min_feedback)
-        .order_by(total_feedback.desc())
-        .limit(limit)
-    )
-
-    rows = db.execute(stmt).all()
+    rows = keyword_sentiment_rows(db, start_dt, end_dt, from_date, to_date, min_feedback, limit)
 
     keywords = []
     for row in rows:
@@ -166,33 +119,42 @@ def get_keyword_sentiments(
     )
 
 
-@router.post("/backfill-keywords", response_model=BackfillResultOut)
+def _backfill_out(job: Job) -> BackfillJobOut:
+    progress = job.progress or {}
+    return BackfillJobOut(
+        job_id=job.id,
+        status=job.status,
+        processed=progress.get("processed", 0),
+        keywords_created=progress.get("keywords_created", 0),
+        checkpoint_item_id=job.checkpoint_id,
+        started_at=job.started_at,
+        ended_at=job.ended_at,
+        error_message=job.error_message,
+    )
+
+
+@router.post("/backfill-keywords", response_model=BackfillJobOut, status_code=202)
 def backfill_keywords(
+    background_tasks: BackgroundTasks,
     _: None = Depends(require_admin_token),
     db: Session = Depends(get_db),
 ):
-    """Extract keywords for existing items that don't have any yet."""
-    existing_item_ids = (
-        select(func.distinct(ItemKeyword.item_id))
-    )
-    items = db.execute(
-        select(Item)
-        .where(Item.id.not_in(existing_item_ids))
-        .order_by(Item.id)
-    ).scalars().all()
-
-    processed = 0
-    keywords_created = 0
-    for item in items:
-        kw_text = build_keyword_text(item.title, item.summary)
-        for kw in extract_keywords(kw_text):
-            db.add(ItemKeyword(
-                item_id=item.id,
-                keyword=kw["keyword"],
-                relevance_score=kw["score"],
-            ))
-            keywords_created += 1
-        processed += 1
-
-    db.commit()
-    return BackfillResultOut(processed=processed, keywords_created=keywords_created)
+    """Start (or resume) extracting keywords for items that don't have any yet."""
+    job, needs_start = start_keyword_backfill(db)
+    if job is None:
+        raise HTTPException(status_code=409, detail="backfill_starting_elsewhere")
+    if needs_start:
+        background_tasks.add_task(run_keyword_backfill, job.id)
+    return _backfill_out(job)
+
+
+@router.get("/backfill-keywords/{job_id}", response_model=BackfillJobOut)
+def get_backfill_progress(
+    job_id: int,
+    _: None = Depends(require_admin_token),
+    db: Session = Depends(get_db),
+):
+    job = db.get(Job, job_id)
+    if not job or job.job_type != KEYWORD_BACKFILL_JOB:
+        raise HTTPException(status_code=404, detail="job_not_found")
+    return _backfill_out(job)
@@ -1,52 +1,117 @@
+import base64
+import json
+from datetime import datetime
 from math import ceil
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.orm import Session
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from app.db import get_db
-from app.models import Feedback, FeedbackAction, Item, Source
-from app.services.events import CURATION_ACTIONS
+from app.models import FeedbackAction, Item, ItemFeedbackState, Source
 
 router = APIRouter(prefix="/bookmarks", tags=["bookmarks"])
 
+CURSOR_NEXT = "n"
+CURSOR_PREV = "p"
+
+
+def _encode_cursor(saved_at: datetime, item_id: int, direction: str) -> str:
+    payload = json.dumps({"t": saved_at.isoformat(), "id": item_id, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        direction = payload["d"]
+        if direction not in (CURSOR_NEXT, CURSOR_PREV):
+            raise ValueError(direction)
+        return datetime.fromisoformat(payload["t"]), int(payload["id"]), direction
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="invalid_cursor") from None
+
+
+def _saved_total(db: Session) -> int:
+    return db.execute(
+        select(func.count())
+        .select_from(ItemFeedbackState)
+        .where(ItemFeedbackState.curation_action == FeedbackAction.SAVED.value)
+    ).scalar_one()
+
 
 @router.get("")
 def get_bookmarks(
     page: int = Query(default=1, ge=1),
     size: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None),
+    include_total: bool = Query(default=False),
     db: Session = Depends(get_db),
 ):
-    latest_feedback = (
-        select(Feedback.item_id, func.max(Feedback.id).label("max_id"))
-        .where(Feedback.action.in_(list(CURATION_ACTIONS)))
-        .group_by(Feedback.item_id)
-        .subquery()
-    )
+    """Saved items, newest first.
 
+    Without ``cursor`` this is the classic page/size listing (with ``total``).
+    Passing ``next_cursor``/``prev_cursor`` from a previous response switches to
+    keyset pagination: each page is a range scan on (saved_at, item_id) and
+    ``total`` is only computed when ``include_total`` is set.
+    """
     base_query = (
-        select(Item, Source, Feedback.created_at)
-        .join(latest_feedback, latest_feedback.c.item_id == Item.id)
-        .join(Feedback, Feedback.id == latest_feedback.c.max_id)
+        select(Item, Source, ItemFeedbackState.curation_at)
+        .join(ItemFeedbackState, ItemFeedbackState.item_id == Item.id)
         .join(Source, Item.source_id == Source.id)
-        .where(Feedback.action == FeedbackAction.SAVED.value)
-        .order_by(Feedback.created_at.desc(), Item.id.desc())
+        .where(ItemFeedbackState.curation_action == FeedbackAction.SAVED.value)
     )
+    sort_key = tuple_(ItemFeedbackState.curation_at, ItemFeedbackState.item_id)
+    newest_first = (ItemFeedbackState.curation_at.desc(), ItemFeedbackState.item_id.desc())
 
-    total = db.execute(select(func.count()).select_from(base_query.subquery())).scalar_one()
-    total_pages = ceil(total / size) if total > 0 else 0
-    offset = (page - 1) * size
+    if cursor is None:
+        total = _saved_total(db)
+        total_pages = ceil(total / size) if total > 0 else 0
+        rows = db.execute(base_query.order_by(*newest_first).offset((page - 1) * size).limit(size)).all()
+        has_next = page < total_pages
+        has_prev = page > 1 and total > 0
+    else:
+        saved_at, item_id, direction = _decode_cursor(cursor)
+        if direction == CURSOR_NEXT:
+            stmt = base_query.where(sort_key < (saved_at, item_id)).order_by(*newest_first)
+        else:
+            stmt = base_query.where(sort_key > (saved_at, item_id)).order_by(
+                ItemFeedbackState.curation_at.asc(), ItemFeedbackState.item_id.asc()
+            )
+        # One extra row tells whether another page exists in the direction of travel.
+        rows = db.execute(stmt.limit(size + 1)).all()
+        has_more = len(rows) > size
+        rows = rows[:size]
+        if direction == CURSOR_NEXT:
+            has_next, has_prev = has_more, True
+        else:
+            rows.reverse()
+            has_next, has_prev = True, has_more
+        total = _saved_total(db) if include_total else None
+        total_pages = (ceil(total / size) if total > 0 else 0) if total is not None else None
+        page = None
 
-    rows = db.execute(base_query.offset(offset).limit(size)).all()
+    next_cursor = None
+    prev_cursor = None
+    if rows:
+        if has_next:
+            last_item, _, last_saved_at = rows[-1]
+            next_cursor = _encode_cursor(last_saved_at, last_item.id, CURSOR_NEXT)
+        if has_prev:
+            first_item, _, first_saved_at = rows[0]
+            prev_cursor = _encode_cursor(first_saved_at, first_item.id, CURSOR_PREV)
 
     return {
         "page": page,
         "size": size,
         "total": total,
         "total_pages": total_pages,
-        "has_next": page < total_pages,
-        "has_prev": page > 1 and total > 0,
+        "has_next": has_next,
+        "has_prev": has_prev,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
         "items": [
             {
                 "item_id": item.id,
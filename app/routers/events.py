@@ -4,18 +4,27 @@ from fastapi import APIRouter, Depends, HTTPException
 
 from app.db import get_db
 from app.models import ItemEventType
-from app.schemas import ClickEventIn
-from app.services.events import create_item_event
+from app.schemas import ClickEventIn, EventBatchIn, EventBatchOut, EventResultOut
+from app.services.events import create_item_event, create_item_events_batch
 
 router = APIRouter(prefix="/events", tags=["events"])
 
 
-@router.post("/click", status_code=201)
+@router.post("/click", status_code=202)
 def create_click_event(payload: ClickEventIn, db: Session = Depends(get_db)):
     try:
-        row = create_item_event(db, payload.item_id, ItemEventType.CLICK.value)
+        queued = create_item_event(db, payload.item_id, ItemEventType.CLICK.value)
     except ValueError:
         raise HTTPException(status_code=404, detail="item_not_found") from None
 
+    return {"ok": True, "queued": queued}
+
+
+@router.post("/batch", response_model=EventBatchOut)
+def create_events_batch(payload: EventBatchIn, db: Session = Depends(get_db)):
+    errors = create_item_events_batch(db, [(e.item_id, e.event_type) for e in payload.events])
     db.commit()
-    return {"ok": True, "event_id": row.id}
+
+    results = [EventResultOut(index=idx, ok=error is None, error=error) for idx, error in enumerate(errors)]
+    accepted = sum(1 for r in results if r.ok)
+    return EventBatchOut(accepted=accepted, rejected=len(results) - accepted, results=results)
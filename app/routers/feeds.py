@@ -1,21 +1,35 @@
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import and_, func, select
-from sqlalchemy.orm import Session, aliased
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from app.config import settings
 from app.db import get_db
-from app.models import Feedback, FeedbackAction, Feed, FeedItem, Item, SlotType, Source
+from app.models import FeedbackAction, Feed, Item, ItemFeedbackState, SlotType
 from app.schemas import FeedCategoryGroup, FeedItemOut, FeedOut, Slot
-from app.services.events import CURATION_ACTIONS, PREFERENCE_ACTIONS, create_feed_impression_events
+from app.services.events import create_feed_impression_events
+from app.services.feed_cache import get_feed_snapshot
 
 router = APIRouter(prefix="/feeds", tags=["feeds"])
 APP_TZ = ZoneInfo(settings.app_timezone)
 
 
+def _item_overlay(db: Session, item_ids: list[int]) -> dict[int, tuple[str | None, str | None, str | None]]:
+    """Per-item state that changes after generation: feedback actions and translation."""
+    if not item_ids:
+        return {}
+
+    rows = db.execute(
+        select(Item.id, Item.translated_title_ko, ItemFeedbackState.curation_action, ItemFeedbackState.preference_action)
+        .outerjoin(ItemFeedbackState, ItemFeedbackState.item_id == Item.id)
+        .where(Item.id.in_(item_ids))
+    ).all()
+    return {item_id: (translated, curation, preference) for item_id, translated, curation, preference in rows}
+
+
 @router.get("/today", response_model=FeedOut)
 def get_today_feed(
     slot: Slot = Query(...),
@@ -24,69 +38,44 @@ def get_today_feed(
     today = datetime.now(APP_TZ).date()
     slot_type = SlotType.AM if slot == Slot.am else SlotType.PM
 
-    feed = db.execute(select(Feed).where(and_(Feed.feed_date == today, Feed.slot == slot_type))).scalar_one_or_none()
+    feed = db.execute(
+        select(Feed.id, Feed.feed_date, Feed.generated_at).where(and_(Feed.feed_date == today, Feed.slot == slot_type))
+    ).first()
     if not feed:
         raise HTTPException(status_code=404, detail="feed_not_generated")
 
-    latest_curation = (
-        select(Feedback.item_id, func.max(Feedback.id).label("max_id"))
-        .where(Feedback.action.in_(list(CURATION_ACTIONS)))
-        .group_by(Feedback.item_id)
-        .subquery()
-    )
-    latest_preference = (
-        select(Feedback.item_id, func.max(Feedback.id).label("max_id"))
-        .where(Feedback.action.in_(list(PREFERENCE_ACTIONS)))
-        .group_by(Feedback.item_id)
-        .subquery()
-    )
-
-    curation_feedback = aliased(Feedback)
-    preference_feedback = aliased(Feedback)
-
-    rows = db.execute(
-        select(FeedItem, Item, Source, curation_feedback.action, preference_feedback.action)
-        .join(Item, FeedItem.item_id == Item.id)
-        .join(Source, Item.source_id == Source.id)
-        .outerjoin(latest_curation, latest_curation.c.item_id == Item.id)
-        .outerjoin(curation_feedback, curation_feedback.id == latest_curation.c.max_id)
-        .outerjoin(latest_preference, latest_preference.c.item_id == Item.id)
-        .outerjoin(preference_feedback, preference_feedback.id == latest_preference.c.max_id)
-        .where(FeedItem.feed_id == feed.id)
-        .order_by(FeedItem.rank.asc())
-    ).all()
+    snapshot = get_feed_snapshot(db, feed.id, feed.feed_date, slot_type.value, feed.generated_at)
+    overlay = _item_overlay(db, [entry["item_id"] for entry in snapshot])
 
-    items = [
-        FeedItemOut(
-            item_id=item.id,
-            title=item.title,
-            translated_title_ko=item.translated_title_ko,
-            source=source.name,
-            category=source.category,
-            url=item.url,
-            short_reason=feed_item.short_reason,
-            rank=feed_item.rank,
-            saved=(curation_action == FeedbackAction.SAVED.value),
-            skipped=(curation_action == FeedbackAction.SKIPPED.value),
-            liked=(preference_action == FeedbackAction.LIKED.value),
-            disliked=(preference_action == FeedbackAction.DISLIKED.value),
-            curation_action=curation_action,
-            preference_action=preference_action,
-            feedback_action=curation_action,
+    items = []
+    for entry in snapshot:
+        translated_title_ko, curation_action, preference_action = overlay.get(entry["item_id"], (None, None, None))
+        items.append(
+            FeedItemOut(
+                item_id=entry["item_id"],
+                title=entry["title"],
+                translated_title_ko=translated_title_ko,
+                source=entry["source"],
+                category=entry["category"],
+                url=entry["url"],
+                short_reason=entry["short_reason"],
+                rank=entry["rank"],
+                saved=(curation_action == FeedbackAction.SAVED.value),
+                skipped=(curation_action == FeedbackAction.SKIPPED.value),
+                liked=(preference_action == FeedbackAction.LIKED.value),
+                disliked=(preference_action == FeedbackAction.DISLIKED.value),
+                curation_action=curation_action,
+                preference_action=preference_action,
+                feedback_action=curation_action,
+            )
         )
-        for feed_item, item, source, curation_action, preference_action in rows
-    ]
 
     grouped: dict[str, list[FeedItemOut]] = {}
     for item in items:
         grouped.setdefault(item.category, []).append(item)
 
-    impression_rows = [(item.id, feed_item.rank, source.id, source.category) for feed_item, item, source, _, _ in rows]
-    try:
-        create_feed_impression_events(db, feed.id, slot_type.value, impression_rows)
-        db.commit()
-    except Exception:
-        db.rollback()
+    impression_rows = [(e["item_id"], e["rank"], e["source_id"], e["category"]) for e in snapshot]
+    create_feed_impression_events(feed.id, slot_type.value, impression_rows)
 
     groups = [FeedCategoryGroup(category=cat, items=cat_items) for cat, cat_items in grouped.items()]
     return FeedOut(feed_date=str(feed.feed_date), slot=slot, generated_at=feed.generated_at, items=items, groups=groups)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Slot(str, Enum):
@@ -49,6 +49,27 @@ class ClickEventIn(BaseModel):
     item_id: int
 
 
+class EventIn(BaseModel):
+    item_id: int
+    event_type: str
+
+
+class EventBatchIn(BaseModel):
+    events: list[EventIn] = Field(min_length=1, max_length=500)
+
+
+class EventResultOut(BaseModel):
+    index: int
+    ok: bool
+    error: str | None = None
+
+
+class EventBatchOut(BaseModel):
+    accepted: int
+    rejected: int
+    results: list[EventResultOut]
+
+
 class MetricsOut(BaseModel):
     date_from: str
     date_to: str
@@ -76,9 +97,15 @@ class KeywordSentimentsOut(BaseModel):
     keywords: list[KeywordSentimentItem]
 
 
-class BackfillResultOut(BaseModel):
+class BackfillJobOut(BaseModel):
+    job_id: int
+    status: str
     processed: int
     keywords_created: int
+    checkpoint_item_id: int | None = None
+    started_at: datetime
+    ended_at: datetime | None = None
+    error_message: str | None = None
 
 
 class HealthOut(BaseModel):
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import logging
+import threading
+
+from sqlalchemy import desc, insert, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import SessionLocal
+from app.models import Item, ItemKeyword, Job
+from app.services.keywords import build_keyword_text, extract_keywords_batch
+from app.services.leader import LeaderLock
+from app.services.rollups import fold_keyword_feedback_for_items
+from app.services.utils import utcnow
+
+logger = logging.getLogger(__name__)
+
+KEYWORD_BACKFILL_JOB = "keyword_backfill"
+# Held by whichever process is running the backfill, across all API workers.
+KEYWORD_BACKFILL_LOCK_KEY = 7_310_003
+
+backfill_lock = LeaderLock(KEYWORD_BACKFILL_LOCK_KEY, name="keyword backfill")
+
+_active_job_id: int | None = None
+_active_lock = threading.Lock()
+
+
+def _latest_backfill_job(db: Session) -> Job | None:
+    return db.execute(
+        select(Job).where(Job.job_type == KEYWORD_BACKFILL_JOB).order_by(desc(Job.id)).limit(1)
+    ).scalar_one_or_none()
+
+
+def start_keyword_backfill(db: Session) -> tuple[Job | None, bool]:
+    """Return the backfill job to run and whether it still needs to be started.
+
+    A backfill already running in this process is returned as-is. Otherwise
+    the process must take ``backfill_lock``; if another process holds it, its
+    latest job is returned without starting anything (None if that process
+    has not committed its job row yet). With the lock, the latest unfinished
+    backfill is resumed from its checkpoint, or a new one is created. The lock
+    is released when ``run_keyword_backfill`` finishes.
+    """
+    global _active_job_id
+    with _active_lock:
+        if _active_job_id is not None:
+            return db.get(Job, _active_job_id), False
+        if not backfill_lock.is_leader():
+            return _latest_backfill_job(db), False
+
+        try:
+            job = _latest_backfill_job(db)
+            if job is None or job.status == "success":
+                job = Job(
+                    job_type=KEYWORD_BACKFILL_JOB,
+                    started_at=utcnow(),
+                    status="running",
+                    progress={"processed": 0, "keywords_created": 0},
+                )
+                db.add(job)
+            else:
+                # A "running" job found here was left behind by a process that died.
+                job.status = "running"
+                job.error_message = None
+                job.ended_at = None
+            db.commit()
+        except Exception:
+            db.rollback()
+            backfill_lock.release()
+            raise
+        _active_job_id = job.id
+        return job, True
+
+
+def run_keyword_backfill(job_id: int) -> None:
+    """Extract keywords for items that have none, committing every chunk.
+
+    Items are streamed with a server-side cursor on a separate read session so
+    the writer can commit each chunk together with the job checkpoint.
+    """
+    global _active_job_id
+    chunk_size = max(1, settings.keyword_backfill_chunk_size)
+    try:
+        with SessionLocal() as read_db, SessionLocal() as db:
+            job = db.get(Job, job_id)
+            progress = dict(job.progress or {"processed": 0, "keywords_created": 0})
+            try:
+                has_keywords = select(ItemKeyword.id).where(ItemKeyword.item_id == Item.id).exists()
+                stream = read_db.execute(
+                    select(Item.id, Item.title, Item.summary)
+                    .where(Item.id > (job.checkpoint_id or 0), ~has_keywords)
+                    .order_by(Item.id)
+                    .execution_options(yield_per=chunk_size)
+                )
+                for chunk in stream.partitions():
+                    keywords = extract_keywords_batch(
+                        [(item_id, build_keyword_text(title, summary)) for item_id, title, summary in chunk]
+                    )
+                    rows = [
+                        {"item_id": item_id, "keyword": kw["keyword"], "relevance_score": kw["score"]}
+                        for item_id, item_keywords in keywords.items()
+                        for kw in item_keywords
+                    ]
+                    if rows:
+                        db.execute(insert(ItemKeyword), rows)
+                        fold_keyword_feedback_for_items(db, list({row["item_id"] for row in rows}))
+                    progress["processed"] += len(chunk)
+                    progress["keywords_created"] += len(rows)
+                    job.checkpoint_id = chunk[-1].id
+                    job.progress = dict(progress)
+                    db.commit()
+
+                job.status = "success"
+                job.ended_at = utcnow()
+                db.commit()
+            except Exception as exc:
+                logger.exception("keyword backfill failed: job_id=%s", job_id)
+                db.rollback()
+                job = db.get(Job, job_id)
+                job.status = "failed"
+                job.error_message = str(exc)
+                job.ended_at = utcnow()
+                db.commit()
+    finally:
+        with _active_lock:
+            _active_job_id = None
+            backfill_lock.release()
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import difflib
+import math
+from collections import Counter, OrderedDict, defaultdict
+from datetime import timedelta
+
+from sqlalchemy import desc, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Item
+from app.services.utils import utcnow
+
+# Character bigrams keep the count filter below selective at the default 0.85
+# threshold; trigrams lose too many shared grams per edit on short titles.
+SHINGLE_SIZE = 2
+
+
+def _normalize(title: str) -> str:
+    return title.lower().strip()
+
+
+def _shingles(text: str) -> Counter:
+    q = SHINGLE_SIZE
+    return Counter(text[i:i + q] for i in range(len(text) - q + 1))
+
+
+class TitleIndex:
+    """In-memory near-duplicate index over recent item titles.
+
+    ``contains_similar`` answers the same question as comparing a title against
+    every indexed title with ``difflib.SequenceMatcher(...).ratio() >= threshold``,
+    but only runs the exact ratio on candidates that pass a length filter and a
+    shingle count filter. Both filters are lossless: a title that reaches the
+    threshold is never filtered out.
+    """
+
+    def __init__(self, threshold: float, max_size: int = 0):
+        self.threshold = threshold
+        self.max_size = max_size
+        self._next_id = 0
+        self._entries: OrderedDict[int, tuple[str, Counter]] = OrderedDict()
+        self._postings: dict[str, dict[int, int]] = defaultdict(dict)
+        self._by_length: dict[int, set[int]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, title: str) -> None:
+        text = _normalize(title)
+        grams = _shingles(text)
+        doc_id = self._next_id
+        self._next_id += 1
+        self._entries[doc_id] = (text, grams)
+        for gram, count in grams.items():
+            self._postings[gram][doc_id] = count
+        self._by_length[len(text)].add(doc_id)
+        while self.max_size > 0 and len(self._entries) > self.max_size:
+            self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        doc_id, (text, grams) = self._entries.popitem(last=False)
+        for gram in grams:
+            ids = self._postings[gram]
+            ids.pop(doc_id, None)
+            if not ids:
+                del self._postings[gram]
+        same_length = self._by_length[len(text)]
+        same_length.discard(doc_id)
+        if not same_length:
+            del self._by_length[len(text)]
+
+    def _length_range(self, la: int) -> tuple[int, int]:
+        # ratio <= 2 * min(la, lb) / (la + lb), so lengths too far apart can never match.
+        r = self.threshold
+        lo = math.ceil(la * r / (2 - r) - 1e-9)
+        hi = math.floor(la * (2 - r) / r + 1e-9)
+        return max(lo, 0), hi
+
+    def _required_shared(self, la: int, lb: int) -> int:
+        # ratio >= r means at least m_min matched characters, so turning one title
+        # into the other needs at most (la - m_min) deletions and (lb - m_min)
+        # insertions. A deletion breaks at most q shingles and an insertion q - 1.
+        q = SHINGLE_SIZE
+        m_min = math.ceil(self.threshold * (la + lb) / 2 - 1e-9)
+        a_to_b = (la - q + 1) - q * (la - m_min) - (q - 1) * (lb - m_min)
+        b_to_a = (lb - q + 1) - q * (lb - m_min) - (q - 1) * (la - m_min)
+        return max(a_to_b, b_to_a)
+
+    def _ratio_at_least(self, text: str, other: str) -> bool:
+        matcher = difflib.SequenceMatcher(a=text, b=other)
+        cutoff = self.threshold
+        return matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff and matcher.ratio() >= cutoff
+
+    def contains_similar(self, title: str) -> bool:
+        if not self._entries:
+            return False
+        if self.threshold <= 0:
+            return True
+        if self.threshold > 1:
+            return False
+
+        text = _normalize(title)
+        la = len(text)
+        lo, hi = self._length_range(la)
+        lengths = [lb for lb in self._by_length if lo <= lb <= hi]
+        if not lengths:
+            return False
+
+        grams = _shingles(text)
+        min_required = min(self._required_shared(la, lb) for lb in lengths)
+        if min_required <= 0:
+            # Titles too short for the count filter: compare every length-compatible title.
+            candidates = set().union(*(self._by_length[lb] for lb in lengths))
+        else:
+            # Count filter: accumulate shared shingle occurrences from the postings.
+            shared: dict[int, int] = defaultdict(int)
+            for gram, count in grams.items():
+                postings = self._postings.get(gram)
+                if not postings:
+                    continue
+                if count == 1:
+                    for doc_id in postings:
+                        shared[doc_id] += 1
+                else:
+                    for doc_id, doc_count in postings.items():
+                        shared[doc_id] += min(count, doc_count)
+            candidates = []
+            for doc_id, n_shared in shared.items():
+                if n_shared < min_required:
+                    continue
+                lb = len(self._entries[doc_id][0])
+                if lo <= lb <= hi and n_shared >= self._required_shared(la, lb):
+                    candidates.append(doc_id)
+
+        for doc_id in candidates:
+            other = self._entries[doc_id][0]
+            if lo <= len(other) <= hi and self._ratio_at_least(text, other):
+                return True
+        return False
+
+
+def load_title_index(db: Session) -> TitleIndex:
+    """Warm a title index from recent items, bounded by the configured window."""
+    window_items = max(0, settings.title_dedupe_window_items)
+    stmt = select(Item.title).order_by(desc(Item.id))
+    if settings.title_dedupe_window_hours > 0:
+        stmt = stmt.where(Item.fetched_at >= utcnow() - timedelta(hours=settings.title_dedupe_window_hours))
+    if window_items:
+        stmt = stmt.limit(window_items)
+
+    index = TitleIndex(settings.title_similarity_threshold, max_size=window_items)
+    for title in reversed(db.execute(stmt).scalars().all()):
+        index.add(title)
+    return index
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import Counter
+from datetime import timedelta
+
+from sqlalchemy import desc, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Item
+from app.services.translation import translate_titles_to_korean
+from app.services.utils import title_key, utcnow
+
+logger = logging.getLogger(__name__)
+
+_run_lock = threading.Lock()
+
+
+def run_translation_enrichment(db: Session, limit: int | None = None) -> dict:
+    """Fill ``translated_title_ko`` for recent items that were saved without one.
+
+    Runs outside ingestion so a slow or failing DeepL never delays new items.
+    Only items inside the ingestion lookback window are considered. A title
+    that comes back untranslated is retried after a doubling backoff and given
+    up on after ``translation_max_attempts`` runs, so it can't keep its place
+    at the head of every batch. Titles held back by an open DeepL circuit
+    breaker are not attempts and stay as they were. Concurrent calls in the
+    same process are skipped rather than queued.
+    """
+    if not settings.deepl_api_key.strip():
+        return {"status": "skipped", "reason": "deepl_not_configured"}
+    if not _run_lock.acquire(blocking=False):
+        return {"status": "skipped", "reason": "already_running"}
+
+    try:
+        now = utcnow()
+        cutoff = now - timedelta(hours=settings.ingestion_lookback_hours)
+        rows = db.execute(
+            select(Item.id, Item.title, Item.translation_attempts)
+            .where(
+                Item.translated_title_ko.is_(None),
+                Item.language != "ko",
+                Item.fetched_at >= cutoff,
+                Item.translation_attempts < max(1, settings.translation_max_attempts),
+                or_(Item.translation_retry_at.is_(None), Item.translation_retry_at <= now),
+            )
+            .order_by(desc(Item.id))
+            .limit(limit or settings.translation_enrichment_batch_limit)
+        ).all()
+        if not rows:
+            return {"status": "success", "pending": 0, "translated": 0}
+
+        stats: Counter = Counter()
+        deferred: set[str] = set()
+        translations = translate_titles_to_korean(
+            db,
+            [row.title for row in rows],
+            stats,
+            concurrency=max(1, settings.translation_worker_concurrency),
+            deferred=deferred,
+        )
+        updates = []
+        failures = []
+        for row, translated in zip(rows, translations):
+            if translated:
+                updates.append({"id": row.id, "translated_title_ko": translated})
+                continue
+            if title_key(row.title) in deferred:
+                continue
+            backoff = settings.translation_retry_backoff_seconds * (2 ** row.translation_attempts)
+            failures.append(
+                {
+                    "id": row.id,
+                    "translation_attempts": row.translation_attempts + 1,
+                    "translation_retry_at": now + timedelta(seconds=backoff),
+                }
+            )
+        if updates:
+            db.execute(update(Item), updates)
+        if failures:
+            db.execute(update(Item), failures)
+        db.commit()
+
+        if failures:
+            logger.info("translation enrichment left %s items untranslated", len(failures))
+        return {
+            "status": "success",
+            "pending": len(rows),
+            "translated": len(updates),
+            "cache_hits": stats["cache_hits"],
+            "cache_misses": stats["cache_misses"],
+            "deferred": stats["deferred"],
+        }
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        _run_lock.release()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+
+from sqlalchemy import insert
+
+from app.config import settings
+from app.db import SessionLocal
+from app.models import ItemEvent
+
+logger = logging.getLogger(__name__)
+
+
+class EventBuffer:
+    """Bounded in-process queue of ``item_events`` rows with a background flusher.
+
+    Rows are written with one multi-row insert once ``flush_size`` rows are
+    queued or ``flush_interval`` seconds have passed. A failed insert is retried
+    up to ``write_attempts`` times with doubling backoff before the batch is
+    dropped. When the queue is full new rows are dropped and counted instead of
+    blocking the request that produced them. ``stop`` drains whatever is still
+    queued.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        flush_size: int,
+        flush_interval: float,
+        write_attempts: int = 1,
+        retry_backoff: float = 0.5,
+    ):
+        self.flush_size = max(1, flush_size)
+        self.flush_interval = max(0.05, flush_interval)
+        self.write_attempts = max(1, write_attempts)
+        self.retry_backoff = max(0.0, retry_backoff)
+        self.dropped = 0
+        self._queue: queue.Queue[dict] = queue.Queue(maxsize=max(1, max_size))
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._drop_lock = threading.Lock()
+
+    def put_many(self, rows: list[dict]) -> int:
+        accepted = 0
+        for row in rows:
+            try:
+                self._queue.put_nowait(row)
+                accepted += 1
+            except queue.Full:
+                self._record_drop(len(rows) - accepted)
+                break
+        return accepted
+
+    def _record_drop(self, count: int) -> None:
+        with self._drop_lock:
+            before = self.dropped
+            self.dropped += count
+        # Log on the first drop and then every 1000 to avoid flooding logs under sustained overload.
+        if before == 0 or before // 1000 != self.dropped // 1000:
+            logger.warning("event buffer full; %s events dropped so far", self.dropped)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="event-buffer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self.flush()
+
+    def flush(self) -> int:
+        written = 0
+        while True:
+            batch = self._take(self.flush_size, wait=0)
+            if not batch:
+                return written
+            self._write(batch)
+            written += len(batch)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self._take(self.flush_size, wait=self.flush_interval)
+            if batch:
+                self._write(batch)
+
+    def _take(self, max_rows: int, wait: float) -> list[dict]:
+        batch: list[dict] = []
+        deadline = time.monotonic() + wait
+        while len(batch) < max_rows:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, rows: list[dict]) -> None:
+        delay = self.retry_backoff
+        for attempt in range(1, self.write_attempts + 1):
+            try:
+                with SessionLocal() as db:
+                    db.execute(insert(ItemEvent), rows)
+                    db.commit()
+                return
+            except Exception:
+                if attempt == self.write_attempts:
+                    self._record_drop(len(rows))
+                    logger.exception("event buffer flush failed; %s events dropped", len(rows))
+                    return
+                logger.warning(
+                    "event buffer flush failed (attempt %s/%s); retrying in %.1fs",
+                    attempt,
+                    self.write_attempts,
+                    delay,
+                    exc_info=True,
+                )
+                time.sleep(delay)
+                delay *= 2
+
+
+event_buffer = EventBuffer(
+    max_size=settings.event_buffer_max_size,
+    flush_size=settings.event_buffer_flush_size,
+    flush_interval=settings.event_buffer_flush_interval_seconds,
+    write_attempts=settings.event_buffer_write_attempts,
+    retry_backoff=settings.event_buffer_retry_backoff_seconds,
+)
@@ -1,13 +1,32 @@
 from __future__ import annotations
 
-from sqlalchemy import desc, select
+import threading
+import time
+from datetime import timedelta
+
+from sqlalchemy import and_, desc, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from app.models import Feed, FeedItem, Feedback, FeedbackAction, Item, ItemEvent, ItemEventType, Source
+from app.config import settings
+from app.models import Feed, FeedItem, Feedback, FeedbackAction, Item, ItemEvent, ItemEventType, ItemFeedbackState, Source
+from app.services.event_buffer import event_buffer
+from app.services.utils import utcnow
 
 CURATION_ACTIONS = {FeedbackAction.SAVED.value, FeedbackAction.SKIPPED.value}
 PREFERENCE_ACTIONS = {FeedbackAction.LIKED.value, FeedbackAction.DISLIKED.value}
 ALL_FEEDBACK_ACTIONS = CURATION_ACTIONS | PREFERENCE_ACTIONS
+EVENT_TYPES = {ItemEventType.IMPRESSION.value, ItemEventType.CLICK.value}
+
+# item_id -> event context for items in recently generated feeds. The dict is
+# never mutated after publication; a refresh swaps in a new one.
+_feed_context: dict[int, dict] = {}
+_feed_context_loaded_at: float | None = None
+_feed_context_reload_lock = threading.Lock()
+
+
+def _slot_value(slot) -> str:
+    return slot.value if hasattr(slot, "value") else str(slot)
 
 
 def _latest_feed_context_for_item(db: Session, item_id: int) -> dict:
@@ -22,11 +41,58 @@ def _latest_feed_context_for_item(db: Session, item_id: int) -> dict:
         return {"feed_id": None, "slot": None, "rank": None}
 
     feed_id, slot, rank = row
-    slot_value = slot.value if hasattr(slot, "value") else str(slot)
-    return {"feed_id": feed_id, "slot": slot_value, "rank": rank}
+    return {"feed_id": feed_id, "slot": _slot_value(slot), "rank": rank}
+
+
+def publish_item_feed_context(db: Session) -> int:
+    """Rebuild the in-memory item -> (feed, slot, rank, source, category) map.
+
+    Called after each feed generation. Only feeds generated within the ingestion
+    lookback window are loaded; anything older falls back to the DB lookup.
+    """
+    global _feed_context, _feed_context_loaded_at
+    cutoff = utcnow() - timedelta(hours=settings.ingestion_lookback_hours)
+    rows = db.execute(
+        select(FeedItem.item_id, FeedItem.feed_id, Feed.slot, FeedItem.rank, Item.source_id, Source.category)
+        .join(Feed, Feed.id == FeedItem.feed_id)
+        .join(Item, Item.id == FeedItem.item_id)
+        .join(Source, Source.id == Item.source_id)
+        .where(Feed.generated_at >= cutoff)
+        .order_by(Feed.generated_at, FeedItem.id)
+    ).all()
+
+    # Ascending order: the most recently generated feed wins, as in _latest_feed_context_for_item.
+    context = {
+        item_id: {"source_id": source_id, "category": category, "feed_id": feed_id, "slot": _slot_value(slot), "rank": rank}
+        for item_id, feed_id, slot, rank, source_id, category in rows
+    }
+    _feed_context = context
+    _feed_context_loaded_at = time.monotonic()
+    return len(context)
+
+
+def _context_is_stale() -> bool:
+    loaded_at = _feed_context_loaded_at
+    return loaded_at is None or time.monotonic() - loaded_at > settings.feed_context_ttl_seconds
+
+
+def _current_feed_context(db: Session) -> dict[int, dict]:
+    # The periodic reload picks up feeds generated by other processes. While one
+    # request reloads, the others keep serving the previous map.
+    if _context_is_stale() and _feed_context_reload_lock.acquire(blocking=_feed_context_loaded_at is None):
+        try:
+            if _context_is_stale():
+                publish_item_feed_context(db)
+        finally:
+            _feed_context_reload_lock.release()
+    return _feed_context
 
 
 def get_item_event_context(db: Session, item_id: int) -> dict | None:
+    cached = _current_feed_context(db).get(item_id)
+    if cached is not None:
+        return cached
+
     item_row = db.execute(
         select(Item.id, Item.source_id, Source.category)
         .join(Source, Source.id == Item.source_id)
@@ -46,6 +112,67 @@ def get_item_event_context(db: Session, item_id: int) -> dict | None:
     }
 
 
+def get_item_event_contexts(db: Session, item_ids: list[int]) -> dict[int, dict]:
+    """Resolve event context for many items; unknown item ids are absent from the result.
+
+    Items missing from the in-memory map are resolved together in one query.
+    """
+    feed_context = _current_feed_context(db)
+    contexts = {item_id: feed_context[item_id] for item_id in item_ids if item_id in feed_context}
+    missing = {item_id for item_id in item_ids if item_id not in contexts}
+    if not missing:
+        return contexts
+
+    latest = (
+        select(
+            FeedItem.item_id,
+            FeedItem.feed_id,
+            Feed.slot,
+            FeedItem.rank,
+            func.row_number()
+            .over(partition_by=FeedItem.item_id, order_by=(desc(Feed.generated_at), desc(FeedItem.id)))
+            .label("rn"),
+        )
+        .join(Feed, Feed.id == FeedItem.feed_id)
+        .where(FeedItem.item_id.in_(missing))
+        .subquery()
+    )
+    rows = db.execute(
+        select(Item.id, Item.source_id, Source.category, latest.c.feed_id, latest.c.slot, latest.c.rank)
+        .join(Source, Source.id == Item.source_id)
+        .outerjoin(latest, and_(latest.c.item_id == Item.id, latest.c.rn == 1))
+        .where(Item.id.in_(missing))
+    ).all()
+    for item_id, source_id, category, feed_id, slot, rank in rows:
+        contexts[item_id] = {
+            "source_id": source_id,
+            "category": category,
+            "feed_id": feed_id,
+            "slot": _slot_value(slot) if slot is not None else None,
+            "rank": rank,
+        }
+    return contexts
+
+
+def _upsert_feedback_state(db: Session, row: Feedback) -> None:
+    if row.action in CURATION_ACTIONS:
+        values = {"curation_action": row.action, "curation_feedback_id": row.id, "curation_at": row.created_at}
+        guard = ItemFeedbackState.curation_feedback_id
+    else:
+        values = {"preference_action": row.action, "preference_feedback_id": row.id}
+        guard = ItemFeedbackState.preference_feedback_id
+
+    stmt = pg_insert(ItemFeedbackState).values(item_id=row.item_id, updated_at=utcnow(), **values)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ItemFeedbackState.item_id],
+            set_={**{key: stmt.excluded[key] for key in values}, "updated_at": stmt.excluded.updated_at},
+            # Concurrent writes for one item: only a newer feedback row may overwrite the state.
+            where=func.coalesce(guard, 0) < stmt.excluded[guard.key],
+        )
+    )
+
+
 def create_feedback_with_context(db: Session, item_id: int, action: str) -> Feedback:
     ctx = get_item_event_context(db, item_id)
     if not ctx:
@@ -61,43 +188,66 @@ def create_feedback_with_context(db: Session, item_id: int, action: str) -> Feed
         feed_id=ctx["feed_id"],
     )
     db.add(row)
+    db.flush()
+    _upsert_feedback_state(db, row)
     return row
 
 
-def create_item_event(db: Session, item_id: int, event_type: str) -> ItemEvent:
+def _event_row(item_id: int, event_type: str, ctx: dict) -> dict:
+    return {
+        "item_id": item_id,
+        "event_type": event_type,
+        "slot": ctx["slot"],
+        "rank": ctx["rank"],
+        "source_id": ctx["source_id"],
+        "category": ctx["category"],
+        "feed_id": ctx["feed_id"],
+        "created_at": utcnow(),
+    }
+
+
+def create_item_event(db: Session, item_id: int, event_type: str) -> bool:
+    """Queue an event for the write-behind buffer; returns False if it was dropped."""
     ctx = get_item_event_context(db, item_id)
     if not ctx:
         raise ValueError("item_not_found")
 
-    row = ItemEvent(
-        item_id=item_id,
-        event_type=event_type,
-        slot=ctx["slot"],
-        rank=ctx["rank"],
-        source_id=ctx["source_id"],
-        category=ctx["category"],
-        feed_id=ctx["feed_id"],
-    )
-    db.add(row)
-    return row
+    return event_buffer.put_many([_event_row(item_id, event_type, ctx)]) == 1
 
 
 def create_feed_impression_events(
-    db: Session,
     feed_id: int,
     slot: str,
     rows: list[tuple[int, int, int, str]],
 ) -> int:
-    for item_id, rank, source_id, category in rows:
-        db.add(
-            ItemEvent(
-                item_id=item_id,
-                event_type=ItemEventType.IMPRESSION.value,
-                feed_id=feed_id,
-                slot=slot,
-                rank=rank,
-                source_id=source_id,
-                category=category,
-            )
-        )
-    return len(rows)
+    """Queue one impression per feed item; returns how many were accepted."""
+    ctx = {"feed_id": feed_id, "slot": slot}
+    return event_buffer.put_many([
+        _event_row(item_id, ItemEventType.IMPRESSION.value, {**ctx, "rank": rank, "source_id": source_id, "category": category})
+        for item_id, rank, source_id, category in rows
+    ])
+
+
+def create_item_events_batch(db: Session, events: list[tuple[int, str]]) -> list[str | None]:
+    """Insert many ``(item_id, event_type)`` events with one bulk insert.
+
+    Returns one entry per event: None when it was stored, otherwise an error code
+    (``invalid_event_type`` / ``item_not_found``). The caller commits.
+    """
+    contexts = get_item_event_contexts(db, list({item_id for item_id, _ in events}))
+    errors: list[str | None] = []
+    rows = []
+    for item_id, event_type in events:
+        if event_type not in EVENT_TYPES:
+            errors.append("invalid_event_type")
+            continue
+        ctx = contexts.get(item_id)
+        if ctx is None:
+            errors.append("item_not_found")
+            continue
+        rows.append(_event_row(item_id, event_type, ctx))
+        errors.append(None)
+
+    if rows:
+        db.execute(insert(ItemEvent), rows)
+    return errors
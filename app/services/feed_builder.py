@@ -2,27 +2,47 @@ from __future__ import annotations
 
 from collections import defaultdict
 from datetime import timedelta
-import random
+import hashlib
+import json
+import logging
+from typing import NamedTuple
 from zoneinfo import ZoneInfo
-from urllib.parse import urlparse
 
-from sqlalchemy import and_, delete, desc, func, select
+import numpy as np
+from sqlalchemy import and_, delete, desc, func, insert, select, update
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.models import Feedback, Feed, FeedItem, Item, Job, SlotType
-from app.services.events import CURATION_ACTIONS
+from app.models import Feed, FeedItem, Item, ItemFeedbackState, Job, SlotType, Source
+from app.services.events import CURATION_ACTIONS, publish_item_feed_context
+from app.services.feed_cache import invalidate_feed_snapshot, snapshot_entry
+from app.services.personalization import keyword_preferences, preference_scores
+from app.services.ranking import rescore_items
 from app.services.utils import utcnow
 
 APP_TZ = ZoneInfo(settings.app_timezone)
+logger = logging.getLogger(__name__)
 
 
-def _reason(item: Item) -> str:
-    return f"[{item.source.category}] Recent from {item.source.name}"
+class _Candidate(NamedTuple):
+    """Projected feed candidate; feed generation never materializes Item rows."""
+
+    item_id: int
+    score: float
+    category: str
+    source_id: int
+    source_name: str
+    domain: str
+    title: str
+    url: str
+
+
+def _reason(candidate: _Candidate) -> str:
+    return f"[{candidate.category}] Recent from {candidate.source_name}"
 
 
 def _pick_next_item(
-    items: list[Item],
+    items: list[_Candidate],
     cursor: int,
     used_domains: set[str],
 ):
@@ -31,8 +51,7 @@ def _pick_next_item(
     fallback_item = None
     while idx < len(items):
         item = items[idx]
-        domain = urlparse(item.canonical_url).netloc
-        if domain not in used_domains:
+        if item.domain not in used_domains:
             return idx + 1, item
         if fallback_item is None:
             fallback_idx = idx
@@ -44,7 +63,139 @@ def _pick_next_item(
     return idx, None
 
 
-def generate_feed_for_slot(db: Session, slot: SlotType):
+def _candidate_columns():
+    return (
+        Item.id.label("item_id"),
+        Item.score.label("score"),
+        Source.category.label("category"),
+        Source.id.label("source_id"),
+        Source.name.label("source_name"),
+        func.coalesce(Item.domain, "").label("domain"),
+        Item.title.label("title"),
+        Item.url.label("url"),
+    )
+
+
+def candidate_statement(cutoff):
+    """Top-scored recent items per category, ranked and capped in one SQL query.
+
+    Keeps the overall top ``max(300, feed_max_items_total * 20)`` window and
+    within it at most ``feed_candidates_per_category`` items per category.
+    """
+    excluded_items = (
+        select(ItemFeedbackState.item_id)
+        .where(ItemFeedbackState.curation_action.in_(list(CURATION_ACTIONS)))
+    )
+    ordering = (desc(Item.score), desc(Item.id))
+    ranked = (
+        select(
+            *_candidate_columns(),
+            func.row_number().over(order_by=ordering).label("overall_rank"),
+            func.row_number().over(partition_by=Source.category, order_by=ordering).label("category_rank"),
+        )
+        .join(Source, Item.source_id == Source.id)
+        .where(Item.fetched_at >= cutoff, Item.id.not_in(excluded_items))
+        .subquery()
+    )
+    return (
+        select(*(ranked.c[name] for name in _Candidate._fields))
+        .where(
+            ranked.c.overall_rank <= max(300, settings.feed_max_items_total * 20),
+            ranked.c.category_rank <= max(1, settings.feed_candidates_per_category),
+        )
+        .order_by(ranked.c.overall_rank)
+    )
+
+
+def _input_fingerprint(db: Session, cutoff) -> str:
+    """Hash of everything a generation run reads: item pool, scores, feedback and feed settings.
+
+    The window's item count and lowest id change when items age out of the
+    lookback window, so the fingerprint moves even without new ingestion.
+    """
+    window = Item.fetched_at >= cutoff
+    keyword_preferences.refresh(db)
+    row = db.execute(
+        select(
+            select(func.max(Item.id)).scalar_subquery(),
+            select(func.min(Item.id)).where(window).scalar_subquery(),
+            select(func.count()).select_from(Item).where(window).scalar_subquery(),
+            select(func.coalesce(func.sum(Item.score), 0.0)).where(window).scalar_subquery(),
+        )
+    ).one()
+    inputs = {
+        "items": [row[0], row[1], row[2]],
+        # Rescoring only ever lowers quantized scores, so their sum moves whenever any score does.
+        "window_score_sum": round(row[3], 4),
+        # The settled mark rather than max(feedback.id): feedback still inside the
+        # settle window is not in the preference weights yet, and must still count
+        # as a change once it is.
+        "feedback_id": keyword_preferences.last_feedback_id,
+        "settings": [
+            settings.ingestion_lookback_hours,
+            settings.feed_min_items,
+            settings.feed_target_items_per_category,
+            settings.feed_max_items_per_category,
+            settings.feed_max_items_total,
+            settings.feed_candidates_per_category,
+            settings.feed_personalization_strength,
+        ],
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+def _stable_uniform(seed: str, item_id: int) -> float:
+    digest = hashlib.blake2b(f"{seed}:{item_id}".encode(), digest_size=8).digest()
+    return (int.from_bytes(digest, "big") + 1) / (2**64 + 1)
+
+
+def _personalized_order(seed: str, candidates: list[_Candidate], preferences: np.ndarray) -> np.ndarray:
+    """Deterministic weighted shuffle of candidates, liked keywords first on average.
+
+    Weighted random sampling keys (u ** (1 / w), compared in log space) with a
+    per-item u seeded by date and slot: reruns reproduce the same order, a new or
+    removed item only shifts its neighbours, and with no learned preferences
+    every weight is 1 and this is a plain shuffle.
+    """
+    u = np.fromiter((_stable_uniform(seed, c.item_id) for c in candidates), dtype=np.float64, count=len(candidates))
+    weights = np.exp(settings.feed_personalization_strength * preferences)
+    return np.argsort(-(np.log(u) / weights), kind="stable")
+
+
+def _sync_feed_items(db: Session, feed_id: int, rows: list[dict]) -> bool:
+    """Bring feed_items for a feed in line with ``rows`` touching only changed rows."""
+    current = {
+        item_id: (row_id, rank, short_reason)
+        for row_id, item_id, rank, short_reason in db.execute(
+            select(FeedItem.id, FeedItem.item_id, FeedItem.rank, FeedItem.short_reason).where(FeedItem.feed_id == feed_id)
+        )
+    }
+    wanted = {row["item_id"]: row for row in rows}
+
+    stale_ids = [row_id for item_id, (row_id, _, _) in current.items() if item_id not in wanted]
+    updates = [
+        {"id": current[item_id][0], "rank": row["rank"], "short_reason": row["short_reason"]}
+        for item_id, row in wanted.items()
+        if item_id in current and current[item_id][1:] != (row["rank"], row["short_reason"])
+    ]
+    inserts = [row for item_id, row in wanted.items() if item_id not in current]
+
+    if stale_ids:
+        db.execute(delete(FeedItem).where(FeedItem.id.in_(stale_ids)))
+    if updates:
+        db.execute(update(FeedItem), updates)
+    if inserts:
+        db.execute(insert(FeedItem), inserts)
+    return bool(stale_ids or updates or inserts)
+
+
+def generate_feed_for_slot(db: Session, slot: SlotType, force: bool = False):
+    """Generate or refresh today's feed for a slot.
+
+    Skipped when the input fingerprint matches the last run (unless ``force``).
+    Otherwise only the feed_items rows that differ are written, and
+    ``generated_at``/snapshot move only when the feed actually changed.
+    """
     started = utcnow()
     job = Job(job_type=f"feed_generation_{slot.value}", started_at=started, status="running")
     db.add(job)
@@ -54,45 +205,38 @@ def generate_feed_for_slot(db: Session, slot: SlotType):
         now = utcnow()
         today = now.astimezone(APP_TZ).date()
 
+        cutoff = now - timedelta(hours=settings.ingestion_lookback_hours)
+        # Scores are written at ingestion; bring freshness decay up to date for the
+        # window before deciding whether anything changed.
+        rescore_items(db, cutoff, now)
+        fingerprint = _input_fingerprint(db, cutoff)
+
         existing = db.execute(select(Feed).where(and_(Feed.feed_date == today, Feed.slot == slot))).scalar_one_or_none()
+        if existing and not force and existing.input_fingerprint == fingerprint:
+            existing_id = existing.id
+            job.status = "skipped"
+            job.ended_at = utcnow()
+            db.commit()
+            return existing_id
         if existing:
-            db.execute(delete(FeedItem).where(FeedItem.feed_id == existing.id))
             feed = existing
-            feed.generated_at = now
         else:
             feed = Feed(feed_date=today, slot=slot, generated_at=now)
             db.add(feed)
             db.flush()
 
-        latest_feedback = (
-            select(Feedback.item_id, func.max(Feedback.id).label("max_id"))
-            .where(Feedback.action.in_(list(CURATION_ACTIONS)))
-            .group_by(Feedback.item_id)
-            .subquery()
-        )
-        excluded_items = (
-            select(Feedback.item_id)
-            .join(latest_feedback, Feedback.id == latest_feedback.c.max_id)
-        )
-
-        cutoff = now - timedelta(hours=settings.ingestion_lookback_hours)
-        items = db.execute(
-            select(Item)
-            .where(Item.fetched_at >= cutoff, Item.id.not_in(excluded_items))
-            .order_by(desc(Item.score), desc(Item.id))
-            .limit(max(300, settings.feed_max_items_total * 20))
-        ).scalars().all()
+        candidates = [_Candidate._make(row) for row in db.execute(candidate_statement(cutoff))]
 
         picked = []
         used_domains = set()
 
-        by_category: dict[str, list[Item]] = defaultdict(list)
-        for item in items:
-            by_category[item.source.category].append(item)
+        preferences = preference_scores(db, [c.item_id for c in candidates])
+        order = _personalized_order(f"{today.isoformat()}:{slot.value}", candidates, preferences)
 
-        rng = random.Random()
-        for cat_items in by_category.values():
-            rng.shuffle(cat_items)
+        by_category: dict[str, list[_Candidate]] = defaultdict(list)
+        for position in order:
+            candidate = candidates[position]
+            by_category[candidate.category].append(candidate)
 
         categories = sorted(by_category.keys(), key=lambda c: by_category[c][0].score if by_category[c] else 0, reverse=True)
         target_per_category = max(1, settings.feed_target_items_per_category)
@@ -113,7 +257,7 @@ def generate_feed_for_slot(db: Session, slot: SlotType):
                 )
                 if not item:
                     continue
-                used_domains.add(urlparse(item.canonical_url).netloc)
+                used_domains.add(item.domain)
                 picked.append(item)
                 cat_counts[category] += 1
 
@@ -127,34 +271,55 @@ def generate_feed_for_slot(db: Session, slot: SlotType):
                 )
                 if not item:
                     break
-                used_domains.add(urlparse(item.canonical_url).netloc)
+                used_domains.add(item.domain)
                 picked.append(item)
                 cat_counts[category] += 1
 
         if len(picked) < settings.feed_min_items:
-            fallback = db.execute(select(Item).order_by(desc(Item.score), desc(Item.id)).limit(settings.feed_min_items)).scalars().all()
-            seen = {x.id for x in picked}
-            for item in fallback:
-                if item.id in seen:
+            fallback = db.execute(
+                select(*_candidate_columns())
+                .join(Source, Item.source_id == Source.id)
+                .order_by(desc(Item.score), desc(Item.id))
+                .limit(settings.feed_min_items)
+            ).all()
+            seen = {x.item_id for x in picked}
+            for item in map(_Candidate._make, fallback):
+                if item.item_id in seen:
                     continue
                 picked.append(item)
                 if len(picked) >= settings.feed_min_items:
                     break
 
-        for idx, item in enumerate(picked, start=1):
-            db.add(
-                FeedItem(
-                    feed_id=feed.id,
-                    item_id=item.id,
-                    rank=idx,
-                    short_reason=_reason(item),
+        snapshot = []
+        feed_item_rows = []
+        for idx, candidate in enumerate(picked, start=1):
+            reason = _reason(candidate)
+            feed_item_rows.append(
+                {"feed_id": feed.id, "item_id": candidate.item_id, "rank": idx, "short_reason": reason}
+            )
+            snapshot.append(
+                snapshot_entry(
+                    candidate.item_id,
+                    candidate.title,
+                    candidate.url,
+                    candidate.source_id,
+                    candidate.source_name,
+                    candidate.category,
+                    idx,
+                    reason,
                 )
             )
 
+        changed = _sync_feed_items(db, feed.id, feed_item_rows) or feed.snapshot is None
+        feed.input_fingerprint = fingerprint
+        if changed:
+            feed.generated_at = now
+            feed.snapshot = snapshot
+
         job.status = "success"
         job.ended_at = utcnow()
+        feed_id = feed.id
         db.commit()
-        return feed.id
     except Exception as exc:
         db.rollback()
         job.status = "failed"
@@ -163,3 +328,13 @@ def generate_feed_for_slot(db: Session, slot: SlotType):
         db.add(job)
         db.commit()
         raise
+
+    if changed:
+        # The feed is committed; a failure to refresh in-process caches must not
+        # turn the job into "failed". Other processes catch up on their TTL reload.
+        try:
+            invalidate_feed_snapshot(today, slot.value)
+            publish_item_feed_context(db)
+        except Exception:
+            logger.warning("publishing feed caches failed: feed_id=%s", feed_id, exc_info=True)
+    return feed_id
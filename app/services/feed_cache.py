@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+from datetime import date, datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Feed, FeedItem, Item, Source
+
+# (feed_date, slot) -> (feed_id, generated_at, snapshot)
+_snapshots: dict[tuple[date, str], tuple[int, datetime, list[dict]]] = {}
+_lock = threading.Lock()
+
+
+def snapshot_entry(
+    item_id: int,
+    title: str,
+    url: str,
+    source_id: int,
+    source_name: str,
+    category: str,
+    rank: int,
+    short_reason: str,
+) -> dict:
+    """Static, feedback-independent part of one feed item."""
+    return {
+        "item_id": item_id,
+        "title": title,
+        "source_id": source_id,
+        "source": source_name,
+        "category": category,
+        "url": url,
+        "short_reason": short_reason,
+        "rank": rank,
+    }
+
+
+def build_feed_snapshot(db: Session, feed_id: int) -> list[dict]:
+    # Feeds generated before snapshots were stored are rebuilt from feed_items.
+    rows = db.execute(
+        select(
+            Item.id,
+            Item.title,
+            Item.url,
+            Source.id,
+            Source.name,
+            Source.category,
+            FeedItem.rank,
+            FeedItem.short_reason,
+        )
+        .join(Item, FeedItem.item_id == Item.id)
+        .join(Source, Item.source_id == Source.id)
+        .where(FeedItem.feed_id == feed_id)
+        .order_by(FeedItem.rank.asc())
+    ).all()
+    return [snapshot_entry(*row) for row in rows]
+
+
+def get_feed_snapshot(db: Session, feed_id: int, feed_date: date, slot: str, generated_at: datetime) -> list[dict]:
+    """Return the cached snapshot for a feed, reloading it when the feed was regenerated.
+
+    ``generated_at`` is part of the cache check so a regeneration in another
+    process is picked up even without an explicit invalidation here.
+    """
+    key = (feed_date, slot)
+    with _lock:
+        cached = _snapshots.get(key)
+    if cached and cached[0] == feed_id and cached[1] == generated_at:
+        return cached[2]
+
+    snapshot = db.execute(select(Feed.snapshot).where(Feed.id == feed_id)).scalar_one_or_none()
+    if snapshot is None:
+        snapshot = build_feed_snapshot(db, feed_id)
+    with _lock:
+        _snapshots[key] = (feed_id, generated_at, snapshot)
+    return snapshot
+
+
+def invalidate_feed_snapshot(feed_date: date, slot: str) -> None:
+    with _lock:
+        _snapshots.pop((feed_date, slot), None)
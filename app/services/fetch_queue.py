@@ -0,0 +1,145 @@
+"""Per-source fetch queue shared by any number of worker processes.
+
+Each enabled source has one ``source_fetch_queue`` row. A worker claims due rows
+with ``FOR UPDATE SKIP LOCKED`` and stamps a lease (``locked_by``/``locked_until``)
+in a short transaction, fetches without holding any database locks, then
+persists and reschedules each source in its own transaction. A worker that dies
+mid-claim simply lets its lease expire; the rows become claimable again after
+``SOURCE_FETCH_VISIBILITY_TIMEOUT_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+
+from sqlalchemy import DateTime, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Source, SourceFetchQueue
+from app.services.dedupe import load_title_index
+from app.services.fetcher import FETCH_FAILED, fetch_specs
+from app.services.ingestion import persist_fetch_result
+from app.services.utils import utcnow
+
+logger = logging.getLogger(__name__)
+
+
+def sync_fetch_queue(db: Session) -> int:
+    """Add queue rows for enabled sources that don't have one yet; due immediately."""
+    now = literal(utcnow(), DateTime(timezone=True))
+    stmt = (
+        pg_insert(SourceFetchQueue)
+        .from_select(
+            ["source_id", "next_run_at", "attempts", "updated_at"],
+            select(Source.id, now, literal(0), now).where(Source.enabled == True),  # noqa: E712
+        )
+        .on_conflict_do_nothing(index_elements=[SourceFetchQueue.source_id])
+    )
+    created = db.execute(stmt).rowcount
+    db.commit()
+    return created
+
+
+def claim_sources(db: Session, worker_id: str, limit: int) -> list[int]:
+    """Lease up to ``limit`` due sources to ``worker_id`` and commit the lease."""
+    now = utcnow()
+    due = (
+        select(SourceFetchQueue.source_id)
+        .join(Source, Source.id == SourceFetchQueue.source_id)
+        .where(
+            Source.enabled == True,  # noqa: E712
+            SourceFetchQueue.next_run_at <= now,
+            or_(SourceFetchQueue.locked_until.is_(None), SourceFetchQueue.locked_until < now),
+        )
+        .order_by(SourceFetchQueue.next_run_at)
+        .limit(limit)
+        .with_for_update(of=SourceFetchQueue, skip_locked=True)
+    )
+    claimed = db.execute(
+        update(SourceFetchQueue)
+        .where(SourceFetchQueue.source_id.in_(due.scalar_subquery()))
+        .values(
+            locked_by=worker_id,
+            locked_until=now + timedelta(seconds=settings.source_fetch_visibility_timeout_seconds),
+            attempts=SourceFetchQueue.attempts + 1,
+            updated_at=now,
+        )
+        .returning(SourceFetchQueue.source_id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.commit()
+    return list(claimed)
+
+
+def _release(db: Session, source_id: int, worker_id: str, status: str, error: str | None) -> None:
+    # Only the current lease holder reschedules; a worker whose lease expired and was
+    # re-claimed must not clobber the new holder's lock.
+    now = utcnow()
+    if status == FETCH_FAILED:
+        queued = db.get(SourceFetchQueue, source_id)
+        attempts = queued.attempts if queued else 1
+        delay = timedelta(minutes=min(settings.source_fetch_retry_max_minutes, 2 ** max(attempts - 1, 0)))
+        values = {"last_error": error}
+    else:
+        delay = timedelta(minutes=settings.source_fetch_interval_minutes)
+        values = {"attempts": 0, "last_error": None}
+    db.execute(
+        update(SourceFetchQueue)
+        .where(SourceFetchQueue.source_id == source_id, SourceFetchQueue.locked_by == worker_id)
+        .values(
+            next_run_at=now + delay,
+            locked_by=None,
+            locked_until=None,
+            last_status=status,
+            updated_at=now,
+            **values,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def process_claimed_sources(db: Session, worker_id: str, source_ids: list[int]) -> dict:
+    """Fetch claimed sources concurrently, then persist and commit each one separately."""
+    if not source_ids:
+        return {"claimed": 0, "inserted": 0, "failed_sources": 0}
+
+    # Plain column values: the commit below would expire ORM sources and force a
+    # refresh SELECT per source just to build the fetch specs.
+    specs = db.execute(
+        select(Source.id, Source.type, Source.url, Source.etag, Source.last_modified, Source.content_hash)
+        .where(Source.id.in_(source_ids))
+        .order_by(Source.id)
+    ).all()
+    title_index = load_title_index(db)
+    db.commit()
+    results = fetch_specs([tuple(spec) for spec in specs])
+
+    inserted = 0
+    failed = 0
+    seen_canonical: set[str] = set()
+    for result in results:
+        status, error = result.status, result.error
+        seen_before = set(seen_canonical)
+        try:
+            source = db.get(Source, result.source_id)
+            _, source_inserted = persist_fetch_result(db, source, result, title_index, seen_canonical)
+            _release(db, result.source_id, worker_id, status, error)
+            db.commit()
+            inserted += source_inserted
+        except Exception as exc:
+            db.rollback()
+            logger.warning("persisting source failed: source_id=%s", result.source_id, exc_info=True)
+            status, error = FETCH_FAILED, str(exc) or exc.__class__.__name__
+            # Titles and URLs from the rolled-back source must not block later duplicates.
+            title_index = load_title_index(db)
+            seen_canonical = seen_before
+            _release(db, result.source_id, worker_id, status, error)
+            db.commit()
+        finally:
+            db.expunge_all()
+        if status == FETCH_FAILED:
+            failed += 1
+    return {"claimed": len(source_ids), "inserted": inserted, "failed_sources": failed}
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import hashlib
+import itertools
+import logging
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from urllib.parse import urlparse
+
+import feedparser
+import httpx
+
+from app.config import settings
+from app.models import Source, SourceType
+
+logger = logging.getLogger(__name__)
+
+HN_SEARCH_URL = "https://hn.algolia.com/api/v1/search_by_date?tags=story&numericFilters=points>20"
+USER_AGENT = "trend-frame-reader/1.0 (+https://github.com/Hsooooo/trend-frame-reader)"
+
+FETCH_CHANGED = "changed"
+FETCH_NOT_MODIFIED = "not_modified"
+FETCH_FAILED = "failed"
+
+
+@dataclass
+class FetchResult:
+    source_id: int
+    status: str = FETCH_CHANGED
+    items: list[dict] = field(default_factory=list)
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str | None = None
+    error: str | None = None
+
+
+def _parse_hn_ts(ts: str | None):
+    if not ts:
+        return None
+    # Example: 2026-02-09T02:41:00Z
+    return datetime.fromisoformat(ts.replace("Z", "+00:00"))
+
+
+def _parse_hn_items(payload: dict, limit: int = 80) -> list[dict]:
+    hits = payload.get("hits", [])
+    out = []
+    for h in hits[:limit]:
+        link = h.get("url")
+        title = h.get("title")
+        if not link or not title:
+            continue
+        out.append({"title": title, "url": link, "published_at": _parse_hn_ts(h.get("created_at"))})
+    return out
+
+
+def _strip_html(text: str) -> str:
+    return re.sub(r"<[^>]+>", "", text).strip()
+
+
+def _parse_rss_items(content: bytes, limit: int = 50) -> list[dict]:
+    feed = feedparser.parse(content)
+    out = []
+    for e in feed.entries[:limit]:
+        link = e.get("link")
+        title = e.get("title")
+        if not link or not title:
+            continue
+        summary_raw = e.get("summary", "") or ""
+        summary = _strip_html(summary_raw) if summary_raw else None
+        out.append({"title": title, "url": link, "published_at": None, "summary": summary})
+    return out
+
+
+class _HostLimiter:
+    """Caps in-flight requests per host; many seeds share one feed host."""
+
+    def __init__(self, per_host: int):
+        self._per_host = max(1, per_host)
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+
+    @contextmanager
+    def slot(self, host: str):
+        with self._lock:
+            sem = self._semaphores.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self._per_host)
+                self._semaphores[host] = sem
+        with sem:
+            yield
+
+
+def _conditional_headers(etag: str | None, last_modified: str | None) -> dict[str, str]:
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def _fetch_one(
+    client: httpx.Client,
+    limiter: _HostLimiter,
+    source_id: int,
+    source_type: SourceType,
+    url: str,
+    etag: str | None,
+    last_modified: str | None,
+    content_hash: str | None,
+) -> FetchResult:
+    fetch_url = HN_SEARCH_URL if source_type == SourceType.HN else url
+    try:
+        with limiter.slot(urlparse(fetch_url).netloc):
+            resp = client.get(fetch_url, headers=_conditional_headers(etag, last_modified))
+        if resp.status_code == 304:
+            return FetchResult(
+                source_id=source_id,
+                status=FETCH_NOT_MODIFIED,
+                etag=resp.headers.get("ETag") or etag,
+                last_modified=resp.headers.get("Last-Modified") or last_modified,
+                content_hash=content_hash,
+            )
+        resp.raise_for_status()
+
+        new_etag = resp.headers.get("ETag") or None
+        new_last_modified = resp.headers.get("Last-Modified") or None
+        # Fallback for servers without validators: an identical body is treated like a 304.
+        body_hash = hashlib.sha256(resp.content).hexdigest()
+        if content_hash and body_hash == content_hash:
+            return FetchResult(
+                source_id=source_id,
+                status=FETCH_NOT_MODIFIED,
+                etag=new_etag,
+                last_modified=new_last_modified,
+                content_hash=body_hash,
+            )
+
+        if source_type == SourceType.HN:
+            items = _parse_hn_items(resp.json())
+        else:
+            items = _parse_rss_items(resp.content)
+        return FetchResult(
+            source_id=source_id,
+            items=items,
+            etag=new_etag,
+            last_modified=new_last_modified,
+            content_hash=body_hash,
+        )
+    except Exception as exc:
+        logger.warning("source fetch failed: source_id=%s url=%s", source_id, fetch_url, exc_info=True)
+        return FetchResult(source_id=source_id, status=FETCH_FAILED, error=str(exc) or exc.__class__.__name__)
+
+
+def _source_spec(source: Source) -> tuple:
+    return (source.id, source.type, source.url, source.etag, source.last_modified, source.content_hash)
+
+
+def _client(concurrency: int) -> httpx.Client:
+    timeout = httpx.Timeout(settings.ingestion_fetch_timeout_seconds)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    return httpx.Client(timeout=timeout, limits=limits, follow_redirects=True, headers={"User-Agent": USER_AGENT})
+
+
+def fetch_sources(sources: list[Source]) -> list[FetchResult]:
+    """Fetch all sources concurrently, bounded globally and per host.
+
+    Conditional GET validators stored on each source are sent along, so
+    unchanged feeds come back as ``not_modified`` without being parsed.
+    Results are returned in the same order as ``sources``; a failed source yields
+    a ``failed`` result with ``error`` set instead of raising.
+    """
+    # Read ORM attributes on the calling thread; workers only see plain values.
+    return fetch_specs([_source_spec(s) for s in sources])
+
+
+def fetch_specs(specs: list[tuple]) -> list[FetchResult]:
+    """``fetch_sources`` for plain specs (see ``_source_spec``), in the same order."""
+    if not specs:
+        return []
+    concurrency = max(1, settings.ingestion_fetch_concurrency)
+    limiter = _HostLimiter(settings.ingestion_fetch_per_host)
+
+    with _client(concurrency) as client:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(specs)), thread_name_prefix="fetch") as pool:
+            futures = [pool.submit(_fetch_one, client, limiter, *spec) for spec in specs]
+            return [f.result() for f in futures]
+
+
+def iter_fetch_results(specs: list[tuple]):
+    """Yield fetch results as they complete, with at most ``concurrency`` in flight.
+
+    Takes plain specs (see ``_source_spec``) so it can run off the session's
+    thread. A new fetch is only started when a result has been handed to the
+    consumer, so a slow consumer throttles fetching instead of buffering bodies.
+    """
+    if not specs:
+        return
+    concurrency = max(1, settings.ingestion_fetch_concurrency)
+    limiter = _HostLimiter(settings.ingestion_fetch_per_host)
+    pending_specs = iter(specs)
+
+    with _client(concurrency) as client:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(specs)), thread_name_prefix="fetch") as pool:
+            in_flight = set()
+            for spec in itertools.islice(pending_specs, concurrency):
+                in_flight.add(pool.submit(_fetch_one, client, limiter, *spec))
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+                    spec = next(pending_specs, None)
+                    if spec is not None:
+                        in_flight.add(pool.submit(_fetch_one, client, limiter, *spec))
@@ -1,146 +1,313 @@
 from __future__ import annotations
 
-import difflib
+import logging
+import queue
+import threading
+from dataclasses import dataclass
 
-import feedparser
-import httpx
-from sqlalchemy import desc, select
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.models import Item, ItemKeyword, Job, Source, SourceType
-from app.services.keywords import extract_keywords, build_keyword_text
+from app.models import Item, ItemKeyword, Job, Source
+from app.services.dedupe import TitleIndex, load_title_index
+from app.services.fetcher import FETCH_CHANGED, FETCH_FAILED, FETCH_NOT_MODIFIED, FetchResult, iter_fetch_results
+from app.services.keywords import build_keyword_text, extract_keywords_batch
 from app.services.ranking import compute_score
-from app.services.translation import translate_title_to_korean
-from app.services.utils import canonicalize_url, detect_language, title_key, utcnow
-
-
-def _parse_hn_ts(ts: str | None):
-    if not ts:
-        return None
-    # Example: 2026-02-09T02:41:00Z
-    from datetime import datetime
-    return datetime.fromisoformat(ts.replace("Z", "+00:00"))
-
-
-def _fetch_hn_items(limit: int = 80) -> list[dict]:
-    url = "https://hn.algolia.com/api/v1/search_by_date?tags=story&numericFilters=points>20"
-    resp = httpx.get(url, timeout=10)
-    resp.raise_for_status()
-    hits = resp.json().get("hits", [])
-    out = []
-    for h in hits[:limit]:
-        link = h.get("url")
-        title = h.get("title")
-        if not link or not title:
+from app.services.utils import canonicalize_url, detect_language, title_key, url_domain, utcnow
+
+logger = logging.getLogger(__name__)
+
+
+def _insert_items(db: Session, rows: list[dict]) -> dict[str, int]:
+    """Insert items in one statement, skipping URLs another run already inserted.
+
+    Returns ``{canonical_url: item_id}`` for the rows that were actually inserted.
+    """
+    if not rows:
+        return {}
+    stmt = (
+        pg_insert(Item)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[Item.canonical_url])
+        .returning(Item.canonical_url, Item.id)
+    )
+    return {canonical: item_id for canonical, item_id in db.execute(stmt).all()}
+
+
+def normalize_entries(result: FetchResult, seen_canonical: set[str]) -> list[tuple[str, dict]]:
+    """Normalize stage: canonicalize entry URLs and drop repeats already seen."""
+    candidates: list[tuple[str, dict]] = []
+    for obj in result.items:
+        canonical = canonicalize_url(obj["url"])
+        if canonical in seen_canonical:
             continue
-        out.append({"title": title, "url": link, "published_at": _parse_hn_ts(h.get("created_at"))})
-    return out
+        seen_canonical.add(canonical)
+        candidates.append((canonical, obj))
+    return candidates
+
 
+def _apply_validators(source: Source, result: FetchResult) -> None:
+    source.etag = result.etag
+    source.last_modified = result.last_modified
+    source.content_hash = result.content_hash
+    source.last_fetched_at = utcnow()
 
-def _strip_html(text: str) -> str:
-    import re
-    return re.sub(r"<[^>]+>", "", text).strip()
 
+def _dedupe_candidates(
+    db: Session,
+    source: Source,
+    candidates: list[tuple[str, dict]],
+    title_index: TitleIndex,
+) -> tuple[list[dict], dict[str, str]]:
+    """Dedupe stage: drop stored URLs and near-duplicate titles, build item rows."""
+    if not candidates:
+        return [], {}
+    existing = set(
+        db.execute(
+            select(Item.canonical_url).where(Item.canonical_url.in_([c for c, _ in candidates]))
+        ).scalars()
+    )
 
-def _fetch_rss_items(url: str, limit: int = 50) -> list[dict]:
-    feed = feedparser.parse(url)
-    out = []
-    for e in feed.entries[:limit]:
-        link = e.get("link")
-        title = e.get("title")
-        if not link or not title:
+    rows: list[dict] = []
+    keyword_texts: dict[str, str] = {}
+    for canonical, obj in candidates:
+        if canonical in existing:
+            continue
+        if title_index.contains_similar(obj["title"]):
             continue
-        summary_raw = e.get("summary", "") or ""
-        summary = _strip_html(summary_raw) if summary_raw else None
-        out.append({"title": title, "url": link, "published_at": None, "summary": summary})
-    return out
-
-
-def _is_similar_title(db: Session, title: str) -> bool:
-    cutoff = settings.title_similarity_threshold
-    recent = db.execute(select(Item.title).order_by(desc(Item.id)).limit(500)).scalars().all()
-    t = title.lower().strip()
-    for r in recent:
-        score = difflib.SequenceMatcher(a=t, b=r.lower().strip()).ratio()
-        if score >= cutoff:
+
+        fetched_at = utcnow()
+        rows.append({
+            "source_id": source.id,
+            "canonical_url": canonical,
+            "url": obj["url"],
+            "domain": url_domain(canonical),
+            "title": obj["title"],
+            # Filled in later by the translation enrichment worker.
+            "translated_title_ko": None,
+            "summary": obj.get("summary"),
+            "published_at": obj.get("published_at"),
+            "fetched_at": fetched_at,
+            "language": detect_language(obj["title"]),
+            "dedupe_key": title_key(obj["title"]),
+            "score": compute_score(source.weight, obj.get("published_at"), fetched_at),
+        })
+        keyword_texts[canonical] = build_keyword_text(obj["title"], obj.get("summary"))
+        title_index.add(obj["title"])
+    return rows, keyword_texts
+
+
+def _store_items(db: Session, rows: list[dict], keyword_texts: dict[str, str]) -> int:
+    """Enrich and persist stages: insert items, then extract and insert their keywords."""
+    inserted_ids = _insert_items(db, rows)
+    keywords = extract_keywords_batch(
+        [(item_id, keyword_texts[canonical]) for canonical, item_id in inserted_ids.items()]
+    )
+    keyword_rows = [
+        {"item_id": item_id, "keyword": kw["keyword"], "relevance_score": kw["score"]}
+        for item_id, item_keywords in keywords.items()
+        for kw in item_keywords
+    ]
+    if keyword_rows:
+        db.execute(insert(ItemKeyword), keyword_rows)
+    return len(inserted_ids)
+
+
+def persist_fetch_result(
+    db: Session,
+    source: Source,
+    result: FetchResult,
+    title_index: TitleIndex,
+    seen_canonical: set[str],
+) -> tuple[int, int]:
+    """Store one source's fetch result: validators, new items and their keywords.
+
+    Does not commit. Returns ``(scanned, inserted)``.
+    """
+    if result.status == FETCH_FAILED:
+        return 0, 0
+    _apply_validators(source, result)
+    if result.status == FETCH_NOT_MODIFIED:
+        return 0, 0
+
+    candidates = normalize_entries(result, seen_canonical)
+    rows, keyword_texts = _dedupe_candidates(db, source, candidates, title_index)
+    return len(result.items), _store_items(db, rows, keyword_texts)
+
+
+_DONE = object()
+
+
+@dataclass
+class _StageFailure:
+    error: BaseException
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.5)
             return True
+        except queue.Full:
+            continue
     return False
 
 
+def _get(q: queue.Queue, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.5)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+def _fetch_stage(specs: list[tuple], out: queue.Queue, stop: threading.Event) -> None:
+    try:
+        for result in iter_fetch_results(specs):
+            if not _put(out, result, stop):
+                return
+    except BaseException as exc:
+        _put(out, _StageFailure(exc), stop)
+    finally:
+        _put(out, _DONE, stop)
+
+
+def _normalize_stage(inp: queue.Queue, out: queue.Queue, stop: threading.Event) -> None:
+    try:
+        while True:
+            result = _get(inp, stop)
+            if result is _DONE:
+                break
+            if isinstance(result, _StageFailure):
+                _put(out, result, stop)
+                continue
+            # Each source commits before the next is deduped against the database,
+            # so repeats only need tracking within one source.
+            candidates = normalize_entries(result, set()) if result.status == FETCH_CHANGED else []
+            if not _put(out, (result, candidates), stop):
+                return
+    except BaseException as exc:
+        _put(out, _StageFailure(exc), stop)
+    finally:
+        _put(out, _DONE, stop)
+
+
+def _staged_fetch(specs: list[tuple]):
+    """Fetch/parse and normalize sources on background threads, yielding per source.
+
+    Stages are connected by bounded queues, so at most a few fetched feeds wait
+    for the (single-threaded) database stages at any time.
+    """
+    size = max(1, settings.ingestion_pipeline_queue_size)
+    fetched: queue.Queue = queue.Queue(maxsize=size)
+    normalized: queue.Queue = queue.Queue(maxsize=size)
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=_fetch_stage, args=(specs, fetched, stop), name="ingest-fetch", daemon=True),
+        threading.Thread(target=_normalize_stage, args=(fetched, normalized, stop), name="ingest-normalize", daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        while True:
+            item = _get(normalized, stop)
+            if item is _DONE:
+                return
+            if isinstance(item, _StageFailure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
 def run_ingestion(db: Session) -> dict:
+    """Fetch every enabled source and store new items, committing source by source.
+
+    fetch -> parse -> normalize run on background threads; dedupe -> enrich ->
+    persist run here, one transaction per source, with the session cleared
+    after each so the identity map never grows with the run. A source that
+    fails to persist is rolled back alone and reported as failed.
+    """
     started = utcnow()
     job = Job(job_type="ingestion", started_at=started, status="running")
     db.add(job)
-    db.flush()
+    db.commit()
+    job_id = job.id
 
     inserted = 0
     scanned = 0
-    seen_canonical: set[str] = set()
+    failed_sources = 0
+    not_modified_sources = 0
+    changed_sources = 0
+    source_stats: dict[int, dict] = {}
 
     try:
-        sources = db.execute(select(Source).where(Source.enabled == True)).scalars().all()  # noqa: E712
-        for source in sources:
-            if source.type == SourceType.HN:
-                items = _fetch_hn_items()
+        title_index = load_title_index(db)
+        sources = db.execute(
+            select(Source.id, Source.name, Source.type, Source.url, Source.etag, Source.last_modified, Source.content_hash)
+            .where(Source.enabled == True)  # noqa: E712
+            .order_by(Source.id)
+        ).all()
+        db.commit()
+        specs = [(row.id, row.type, row.url, row.etag, row.last_modified, row.content_hash) for row in sources]
+        names = {row.id: row.name for row in sources}
+
+        for result, candidates in _staged_fetch(specs):
+            status = result.status
+            if status == FETCH_FAILED:
+                failed_sources += 1
             else:
-                items = _fetch_rss_items(source.url)
-
-            for obj in items:
-                scanned += 1
-                canonical = canonicalize_url(obj["url"])
-                if canonical in seen_canonical:
-                    continue
-                exists = db.execute(select(Item.id).where(Item.canonical_url == canonical)).scalar_one_or_none()
-                if exists:
-                    continue
-
-                if _is_similar_title(db, obj["title"]):
-                    continue
-
-                language = detect_language(obj["title"])
-                translated_title_ko = None
-                if language != "ko":
-                    translated_title_ko = translate_title_to_korean(obj["title"])
-
-                item = Item(
-                    source_id=source.id,
-                    canonical_url=canonical,
-                    url=obj["url"],
-                    title=obj["title"],
-                    translated_title_ko=translated_title_ko,
-                    summary=obj.get("summary"),
-                    published_at=obj.get("published_at"),
-                    fetched_at=utcnow(),
-                    language=language,
-                    dedupe_key=title_key(obj["title"]),
-                    score=compute_score(source.weight, obj.get("published_at")),
-                )
-                db.add(item)
-                db.flush()
-
-                kw_text = build_keyword_text(obj["title"], obj.get("summary"))
-                for kw in extract_keywords(kw_text):
-                    db.add(ItemKeyword(
-                        item_id=item.id,
-                        keyword=kw["keyword"],
-                        relevance_score=kw["score"],
-                    ))
-
-                seen_canonical.add(canonical)
-                inserted += 1
-
-            source.last_fetched_at = utcnow()
+                try:
+                    source = db.get(Source, result.source_id)
+                    _apply_validators(source, result)
+                    source_inserted = 0
+                    source_scanned = 0
+                    if status == FETCH_CHANGED:
+                        rows, keyword_texts = _dedupe_candidates(db, source, candidates, title_index)
+                        source_inserted = _store_items(db, rows, keyword_texts)
+                        source_scanned = len(result.items)
+                    db.commit()
+                    # Counted only once the source's transaction is durable.
+                    inserted += source_inserted
+                    scanned += source_scanned
+                except Exception:
+                    db.rollback()
+                    logger.warning("persisting source failed: source_id=%s", result.source_id, exc_info=True)
+                    status = FETCH_FAILED
+                    failed_sources += 1
+                    # Titles from the rolled-back source must not block later near-duplicates.
+                    title_index = load_title_index(db)
+                    db.commit()
+                finally:
+                    db.expunge_all()
+                if status == FETCH_NOT_MODIFIED:
+                    not_modified_sources += 1
+                elif status == FETCH_CHANGED:
+                    changed_sources += 1
+            source_stats[result.source_id] = {"source_id": result.source_id, "name": names[result.source_id], "status": status}
 
+        job = db.get(Job, job_id)
         job.status = "success"
         job.ended_at = utcnow()
         db.commit()
-        return {"scanned": scanned, "inserted": inserted}
+        return {
+            "scanned": scanned,
+            "inserted": inserted,
+            "changed_sources": changed_sources,
+            "not_modified_sources": not_modified_sources,
+            "failed_sources": failed_sources,
+            "sources": [source_stats[spec[0]] for spec in specs if spec[0] in source_stats],
+        }
     except Exception as exc:
         db.rollback()
+        job = db.get(Job, job_id)
         job.status = "failed"
         job.error_message = str(exc)
         job.ended_at = utcnow()
-        db.add(job)
         db.commit()
         raise
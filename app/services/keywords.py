@@ -1,13 +1,32 @@
 from __future__ import annotations
 
 import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 
 import yake
 
+from app.config import settings
 from app.services.utils import detect_language
 
 logger = logging.getLogger(__name__)
 
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+@lru_cache(maxsize=8)
+def _get_extractor(lan: str, max_keywords: int) -> yake.KeywordExtractor:
+    return yake.KeywordExtractor(
+        lan=lan,
+        n=2,
+        dedupLim=0.9,
+        top=max_keywords,
+    )
+
 
 def extract_keywords(text: str, max_keywords: int = 10) -> list[dict]:
     """Extract keywords from text using YAKE.
@@ -22,19 +41,59 @@ def extract_keywords(text: str, max_keywords: int = 10) -> list[dict]:
         lang = detect_language(text)
         lan = "ko" if lang == "ko" else "en"
 
-        kw_extractor = yake.KeywordExtractor(
-            lan=lan,
-            n=2,
-            dedupLim=0.9,
-            top=max_keywords,
-        )
-        raw = kw_extractor.extract_keywords(text)
+        raw = _get_extractor(lan, max_keywords).extract_keywords(text)
         return [{"keyword": kw, "score": float(score)} for kw, score in raw]
     except Exception:
         logger.warning("keyword extraction failed", exc_info=True)
         return []
 
 
+def _extract_chunk(pairs: list[tuple[int, str]], max_keywords: int) -> list[tuple[int, list[dict]]]:
+    return [(item_id, extract_keywords(text, max_keywords)) for item_id, text in pairs]
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: the API process runs scheduler and server threads, which fork does not copy safely.
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.keyword_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def extract_keywords_batch(pairs: list[tuple[int, str]], max_keywords: int = 10) -> dict[int, list[dict]]:
+    """Extract keywords for many ``(item_id, text)`` pairs.
+
+    Batches larger than ``KEYWORD_CHUNK_SIZE`` are split into chunks and fanned
+    out over a shared process pool of ``KEYWORD_WORKERS`` processes; smaller
+    batches, or ``KEYWORD_WORKERS <= 1``, run inline.
+    Returns ``{item_id: [{"keyword": str, "score": float}, ...]}``.
+    """
+    if not pairs:
+        return {}
+
+    chunk_size = max(1, settings.keyword_chunk_size)
+    if settings.keyword_workers <= 1 or len(pairs) <= chunk_size:
+        return dict(_extract_chunk(pairs, max_keywords))
+
+    chunks = [pairs[start:start + chunk_size] for start in range(0, len(pairs), chunk_size)]
+    results: dict[int, list[dict]] = {}
+    for chunk_result in _get_pool().map(_extract_chunk, chunks, repeat(max_keywords)):
+        results.update(chunk_result)
+    return results
+
+
+def shutdown_keyword_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
 def build_keyword_text(title: str, summary: str | None) -> str:
     """Combine title and summary for keyword extraction."""
     parts = [title]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import logging
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from app.db import engine
+
+logger = logging.getLogger(__name__)
+
+# Session-level advisory lock held by the one process allowed to run scheduled jobs.
+SCHEDULER_LEADER_LOCK_KEY = 7_310_002
+
+
+class LeaderLock:
+    """Leader election over a Postgres session-level advisory lock.
+
+    The leader keeps one connection open holding the lock. If the process dies
+    its backend goes away, Postgres releases the lock, and the next follower to
+    call ``is_leader`` takes over.
+    """
+
+    def __init__(self, key: int, name: str = "scheduler leader"):
+        self._key = key
+        self._name = name
+        self._lock = threading.Lock()
+        self._conn: Connection | None = None
+
+    def is_leader(self) -> bool:
+        """Check (and heartbeat) leadership, trying to acquire it if free."""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    # Same session still alive means the lock is still ours.
+                    self._conn.execute(text("SELECT 1"))
+                    return True
+                except DBAPIError:
+                    logger.warning("%s connection lost; re-electing", self._name, exc_info=True)
+                    self._discard()
+
+            conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+            try:
+                acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self._key}).scalar_one()
+            except DBAPIError:
+                conn.invalidate()
+                conn.close()
+                raise
+            if not acquired:
+                conn.close()
+                return False
+            logger.info("this process now holds the %s lock", self._name)
+            self._conn = conn
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self._key})
+                self._conn.close()
+                self._conn = None
+            except DBAPIError:
+                self._discard()
+
+    def _discard(self) -> None:
+        # Never return a connection that may still hold the lock to the pool.
+        try:
+            self._conn.invalidate()
+            self._conn.close()
+        except DBAPIError:
+            pass
+        self._conn = None
+
+
+scheduler_leader = LeaderLock(SCHEDULER_LEADER_LOCK_KEY)
@@ -0,0 +1,311 @@
+"""Versioned schema migrations without Alembic.
+
+Tables that don't exist yet are still created by ``Base.metadata.create_all`` on
+startup; migrations cover everything ``create_all`` cannot do on an existing
+database (new columns, type changes, data backfills, extra indexes). Applied
+versions are recorded in ``schema_migrations`` and never re-run.
+
+Add a new ``Migration`` with the next version number instead of editing an
+applied one. Indexes are declared separately and built with
+``CREATE INDEX CONCURRENTLY`` outside a transaction so large tables stay
+writable while they build.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+# Session-level advisory lock key so concurrent app boots don't migrate twice.
+MIGRATION_LOCK_KEY = 7_310_001
+MIGRATION_LOCK_POLL_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class ManagedIndex:
+    name: str
+    table: str
+    definition: str
+
+    def create_sql(self) -> str:
+        return f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.name} ON {self.table} {self.definition}"
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    statements: tuple[str, ...] = ()
+    indexes: tuple[ManagedIndex, ...] = ()
+
+
+BASELINE_STATEMENTS = (
+    "ALTER TABLE sources ADD COLUMN IF NOT EXISTS category VARCHAR(64) NOT NULL DEFAULT 'general'",
+    "ALTER TABLE items ADD COLUMN IF NOT EXISTS translated_title_ko VARCHAR(512)",
+    """
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1
+            FROM information_schema.columns
+            WHERE table_name = 'feedback'
+              AND column_name = 'action'
+              AND data_type = 'USER-DEFINED'
+        ) THEN
+            ALTER TABLE feedback
+            ALTER COLUMN action TYPE VARCHAR(32)
+            USING action::text;
+        END IF;
+    END $$;
+    """,
+    "ALTER TABLE feedback ADD COLUMN IF NOT EXISTS slot VARCHAR(8)",
+    "ALTER TABLE feedback ADD COLUMN IF NOT EXISTS rank INTEGER",
+    "ALTER TABLE feedback ADD COLUMN IF NOT EXISTS source_id INTEGER",
+    "ALTER TABLE feedback ADD COLUMN IF NOT EXISTS category VARCHAR(64)",
+    "ALTER TABLE feedback ADD COLUMN IF NOT EXISTS feed_id INTEGER",
+    # Normalize historical enum-name rows (e.g. SAVED/SKIPPED) to lowercase values.
+    "UPDATE feedback SET action = lower(action) WHERE action <> lower(action)",
+    """
+    CREATE TABLE IF NOT EXISTS item_events (
+        id SERIAL PRIMARY KEY,
+        item_id INTEGER NOT NULL REFERENCES items(id),
+        event_type VARCHAR(32) NOT NULL,
+        slot VARCHAR(8),
+        rank INTEGER,
+        source_id INTEGER REFERENCES sources(id),
+        category VARCHAR(64),
+        feed_id INTEGER REFERENCES feeds(id),
+        created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_item_events_type_created_at ON item_events(event_type, created_at)",
+    # Phase 2: summary field and item_keywords table for keyword sentiment analysis
+    "ALTER TABLE items ADD COLUMN IF NOT EXISTS summary TEXT",
+    """
+    CREATE TABLE IF NOT EXISTS item_keywords (
+        id SERIAL PRIMARY KEY,
+        item_id INTEGER NOT NULL REFERENCES items(id),
+        keyword VARCHAR(128) NOT NULL,
+        relevance_score FLOAT NOT NULL DEFAULT 0.0,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_item_keywords_keyword ON item_keywords(keyword)",
+    "CREATE INDEX IF NOT EXISTS idx_item_keywords_item_id ON item_keywords(item_id)",
+    # Conditional GET validators from the last successful fetch
+    "ALTER TABLE sources ADD COLUMN IF NOT EXISTS etag VARCHAR(255)",
+    "ALTER TABLE sources ADD COLUMN IF NOT EXISTS last_modified VARCHAR(64)",
+    "ALTER TABLE sources ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)",
+    # Resumable background jobs (keyword backfill) keep a checkpoint and progress counters
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS checkpoint_id INTEGER",
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS progress JSON",
+    # Serialized static feed content written at generation time
+    "ALTER TABLE feeds ADD COLUMN IF NOT EXISTS snapshot JSON",
+    # One-time backfill of the materialized latest-feedback state from feedback history.
+    # DISTINCT ON sorts feedback once instead of probing it per item, so it needs no
+    # feedback(item_id) index (those are built CONCURRENTLY in migration 2).
+    """
+    INSERT INTO item_feedback_state (
+        item_id, curation_action, curation_feedback_id, curation_at,
+        preference_action, preference_feedback_id, updated_at
+    )
+    SELECT COALESCE(c.item_id, p.item_id), c.action, c.id, c.created_at, p.action, p.id, NOW()
+    FROM (
+        SELECT DISTINCT ON (item_id) item_id, id, action, created_at FROM feedback
+        WHERE action IN ('saved', 'skipped')
+        ORDER BY item_id, id DESC
+    ) c
+    FULL JOIN (
+        SELECT DISTINCT ON (item_id) item_id, id, action FROM feedback
+        WHERE action IN ('liked', 'disliked')
+        ORDER BY item_id, id DESC
+    ) p ON p.item_id = c.item_id
+    WHERE NOT EXISTS (SELECT 1 FROM item_feedback_state)
+    ON CONFLICT (item_id) DO NOTHING
+    """,
+)
+
+# Indexes behind the hot read paths. feeds(feed_date, slot) is already covered
+# by the uq_feed_date_slot constraint.
+HOT_QUERY_INDEXES = (
+    # Keyword sentiment tail and rollup: liked/disliked feedback by item
+    ManagedIndex("idx_feedback_action_item_id", "feedback", "(action, item_id, id)"),
+    # Latest curation / preference feedback per item
+    ManagedIndex("idx_feedback_curation", "feedback", "(item_id, id DESC) WHERE action IN ('saved', 'skipped')"),
+    ManagedIndex("idx_feedback_preference", "feedback", "(item_id, id DESC) WHERE action IN ('liked', 'disliked')"),
+    # Feedback by item regardless of action
+    ManagedIndex("idx_feedback_item_id", "feedback", "(item_id)"),
+    # Feed candidate window
+    ManagedIndex("idx_items_fetched_at_score", "items", "(fetched_at, score)"),
+    # Item -> feed attribution and event lookups by feed
+    ManagedIndex("idx_feed_items_item_id", "feed_items", "(item_id)"),
+    ManagedIndex("idx_item_events_feed_id", "item_events", "(feed_id)"),
+    # Feed exclusion of curated items and GET /bookmarks keyset scans
+    ManagedIndex(
+        "idx_item_feedback_state_curated",
+        "item_feedback_state",
+        "(item_id) WHERE curation_action IN ('saved', 'skipped')",
+    ),
+    ManagedIndex(
+        "idx_item_feedback_state_saved",
+        "item_feedback_state",
+        "(curation_at DESC, item_id DESC) WHERE curation_action = 'saved'",
+    ),
+    ManagedIndex(
+        "idx_item_feedback_state_preference",
+        "item_feedback_state",
+        "(item_id) WHERE preference_action IN ('liked', 'disliked')",
+    ),
+)
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "baseline_upgrades", statements=BASELINE_STATEMENTS),
+    Migration(2, "hot_query_indexes", indexes=HOT_QUERY_INDEXES),
+    Migration(
+        3,
+        "item_domain",
+        statements=(
+            "ALTER TABLE items ADD COLUMN IF NOT EXISTS domain VARCHAR(255)",
+            # Same value as urlparse(canonical_url).netloc for the http(s) URLs we store.
+            """
+            UPDATE items
+            SET domain = COALESCE(substring(canonical_url from '^[A-Za-z][A-Za-z0-9+.-]*://([^/?#]*)'), '')
+            WHERE domain IS NULL
+            """,
+        ),
+        indexes=(ManagedIndex("idx_items_domain", "items", "(domain)"),),
+    ),
+    Migration(
+        4,
+        "feed_input_fingerprint",
+        statements=("ALTER TABLE feeds ADD COLUMN IF NOT EXISTS input_fingerprint VARCHAR(64)",),
+    ),
+    Migration(
+        5,
+        "source_fetch_queue_due",
+        indexes=(ManagedIndex("idx_source_fetch_queue_next_run_at", "source_fetch_queue", "(next_run_at)"),),
+    ),
+    Migration(
+        6,
+        "item_translation_attempts",
+        statements=(
+            "ALTER TABLE items ADD COLUMN IF NOT EXISTS translation_attempts INTEGER NOT NULL DEFAULT 0",
+            "ALTER TABLE items ADD COLUMN IF NOT EXISTS translation_retry_at TIMESTAMPTZ",
+        ),
+    ),
+    Migration(
+        7,
+        "row_inserted_at",
+        statements=(
+            # created_at can be stamped long before the row is written (buffered events).
+            "ALTER TABLE item_events ADD COLUMN IF NOT EXISTS inserted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()",
+            "ALTER TABLE feedback ADD COLUMN IF NOT EXISTS inserted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()",
+        ),
+    ),
+)
+
+
+def _ensure_version_table(conn: Connection) -> None:
+    conn.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name VARCHAR(128) NOT NULL,
+                applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            )
+            """
+        )
+    )
+
+
+def _applied_versions(conn: Connection) -> set[int]:
+    return set(conn.execute(text("SELECT version FROM schema_migrations")).scalars().all())
+
+
+def _build_index(conn: Connection, index: ManagedIndex) -> None:
+    # A failed concurrent build leaves an INVALID index that IF NOT EXISTS would keep.
+    invalid = conn.execute(
+        text(
+            """
+            SELECT 1 FROM pg_index x JOIN pg_class c ON c.oid = x.indexrelid
+            WHERE c.relname = :name AND NOT x.indisvalid
+            """
+        ),
+        {"name": index.name},
+    ).first()
+    if invalid:
+        logger.warning("dropping invalid index %s before rebuilding", index.name)
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index.name}"))
+    conn.execute(text(index.create_sql()))
+
+
+def _apply(engine: Engine, migration: Migration) -> None:
+    if migration.statements:
+        with engine.begin() as conn:
+            for statement in migration.statements:
+                conn.execute(text(statement))
+    if migration.indexes:
+        # CONCURRENTLY cannot run inside a transaction block.
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for index in migration.indexes:
+                _build_index(conn, index)
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+            {"version": migration.version, "name": migration.name},
+        )
+
+
+def _pending(conn: Connection) -> list[Migration]:
+    if conn.execute(text("SELECT to_regclass('schema_migrations')")).scalar_one() is None:
+        return sorted(MIGRATIONS, key=lambda m: m.version)
+    applied = _applied_versions(conn)
+    return [m for m in sorted(MIGRATIONS, key=lambda m: m.version) if m.version not in applied]
+
+
+def _wait_for_lock(conn: Connection) -> bool:
+    """Take the migration lock, or return False once another process applied everything.
+
+    Polls ``pg_try_advisory_lock`` instead of blocking in ``pg_advisory_lock``: a
+    backend blocked in that call holds a snapshot, and ``CREATE INDEX
+    CONCURRENTLY`` in the lock holder waits for every older snapshot, which
+    would deadlock undetectably with several processes booting at once.
+    """
+    while True:
+        if conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY}).scalar_one():
+            return True
+        if not _pending(conn):
+            return False
+        time.sleep(MIGRATION_LOCK_POLL_SECONDS)
+
+
+def run_migrations(engine: Engine) -> list[int]:
+    """Apply pending migrations in version order; returns the versions applied."""
+    applied_now = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_conn:
+        if not _wait_for_lock(lock_conn):
+            return applied_now
+        try:
+            _ensure_version_table(lock_conn)
+            for migration in _pending(lock_conn):
+                logger.info("applying migration %s_%s", migration.version, migration.name)
+                _apply(engine, migration)
+                applied_now.append(migration.version)
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    return applied_now
+
+
+if __name__ == "__main__":
+    from app.db import engine
+
+    logging.basicConfig(level=logging.INFO)
+    versions = run_migrations(engine)
+    print(f"applied: {versions}" if versions else "schema up to date")
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+from datetime import timedelta
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Feedback, FeedbackAction, ItemKeyword
+
+# Pseudo-count added to each keyword's like+dislike total, so one vote doesn't
+# swing a keyword to +/-1.
+PRIOR_VOTES = 2.0
+
+
+class KeywordPreferences:
+    """Per-keyword like/dislike counts, folded in incrementally from feedback.
+
+    The first refresh aggregates all liked/disliked feedback joined to
+    item_keywords; later refreshes only read feedback past the last seen id.
+    Feedback younger than ``ROLLUP_SETTLE_SECONDS`` waits for the next refresh
+    so an insert still in flight with a lower id is not skipped.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index: dict[str, int] = {}
+        self._liked = np.zeros(0)
+        self._disliked = np.zeros(0)
+        self._last_feedback_id = 0
+
+    def refresh(self, db: Session) -> None:
+        with self._lock:
+            # Database clock, same as the inserted_at default.
+            settle_cutoff = func.now() - timedelta(seconds=settings.rollup_settle_seconds)
+            upper = db.execute(
+                select(func.max(Feedback.id)).where(
+                    Feedback.id > self._last_feedback_id, Feedback.inserted_at < settle_cutoff
+                )
+            ).scalar_one_or_none()
+            if upper is None:
+                return
+
+            rows = db.execute(
+                select(
+                    ItemKeyword.keyword,
+                    func.count().filter(Feedback.action == FeedbackAction.LIKED.value),
+                    func.count().filter(Feedback.action == FeedbackAction.DISLIKED.value),
+                )
+                .join(ItemKeyword, ItemKeyword.item_id == Feedback.item_id)
+                .where(
+                    Feedback.id > self._last_feedback_id,
+                    Feedback.id <= upper,
+                    Feedback.action.in_([FeedbackAction.LIKED.value, FeedbackAction.DISLIKED.value]),
+                )
+                .group_by(ItemKeyword.keyword)
+            ).all()
+
+            for keyword, _, _ in rows:
+                if keyword not in self._index:
+                    self._index[keyword] = len(self._index)
+            if len(self._index) > len(self._liked):
+                grow = len(self._index) - len(self._liked)
+                self._liked = np.concatenate([self._liked, np.zeros(grow)])
+                self._disliked = np.concatenate([self._disliked, np.zeros(grow)])
+            if rows:
+                positions = np.fromiter((self._index[keyword] for keyword, _, _ in rows), dtype=np.int64, count=len(rows))
+                self._liked[positions] += np.fromiter((r[1] for r in rows), dtype=np.float64, count=len(rows))
+                self._disliked[positions] += np.fromiter((r[2] for r in rows), dtype=np.float64, count=len(rows))
+            self._last_feedback_id = upper
+
+    @property
+    def last_feedback_id(self) -> int:
+        """Settled feedback high-water mark the current weights include."""
+        with self._lock:
+            return self._last_feedback_id
+
+    def snapshot(self) -> tuple[dict[str, int], np.ndarray]:
+        """Keyword -> column map and the weight vector in [-1, 1]."""
+        with self._lock:
+            weights = (self._liked - self._disliked) / (self._liked + self._disliked + PRIOR_VOTES)
+            return dict(self._index), weights
+
+
+keyword_preferences = KeywordPreferences()
+
+
+def preference_scores(db: Session, item_ids: list[int]) -> np.ndarray:
+    """Mean learned keyword weight per item, aligned with ``item_ids``.
+
+    Items are treated as sparse keyword vectors: one query fetches every
+    (item, keyword) pair for the batch and a single ``bincount`` computes all
+    the dot products. Items without keywords score 0.
+    """
+    scores = np.zeros(len(item_ids))
+    if not item_ids:
+        return scores
+
+    keyword_preferences.refresh(db)
+    index, weights = keyword_preferences.snapshot()
+    pairs = db.execute(
+        select(ItemKeyword.item_id, ItemKeyword.keyword).where(ItemKeyword.item_id.in_(item_ids))
+    ).all()
+    if not pairs or not index:
+        return scores
+
+    row_of = {item_id: row for row, item_id in enumerate(item_ids)}
+    rows = np.fromiter((row_of[item_id] for item_id, _ in pairs), dtype=np.int64, count=len(pairs))
+    cols = np.fromiter((index.get(keyword, -1) for _, keyword in pairs), dtype=np.int64, count=len(pairs))
+    known = cols >= 0
+    totals = np.bincount(rows[known], weights=weights[cols[known]], minlength=len(item_ids))
+    keyword_counts = np.bincount(rows, minlength=len(item_ids))
+    np.divide(totals, keyword_counts, out=scores, where=keyword_counts > 0)
+    return scores
@@ -0,0 +1,133 @@
+"""EXPLAIN-based guard against hot queries falling back to sequential scans.
+
+Each check mirrors one read path (feed page, bookmarks, metrics and keyword
+sentiments) and is planned against the live database. A sequential scan on a
+table whose planner row estimate is at least ``min_rows`` counts as a failure;
+small tables are skipped because a seq scan is the right plan for them.
+
+With ``strict`` the check disables ``enable_seqscan`` for the transaction and
+looks at every table. The planner then only picks a sequential scan when no
+index can serve the query, which makes the check meaningful on a small test
+database; ``tests/test_query_plans.py`` runs it that way.
+
+Run ``python -m app.services.query_plans`` after migrating; it exits non-zero
+when a check fails.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import (
+    Feed,
+    FeedbackAction,
+    Item,
+    ItemFeedbackState,
+    SlotType,
+    Source,
+)
+from app.services.feed_builder import candidate_statement
+from app.services.rollups import event_metrics_statement, keyword_sentiment_statement
+from app.services.utils import utcnow
+
+APP_TZ = ZoneInfo(settings.app_timezone)
+DEFAULT_MIN_ROWS = 10_000
+
+
+@dataclass
+class PlanViolation:
+    query: str
+    relation: str
+    estimated_rows: float
+
+
+def _hot_queries() -> dict[str, object]:
+    now = utcnow()
+    today = now.astimezone(APP_TZ).date()
+    window_start = datetime.combine(today - timedelta(days=6), time.min, APP_TZ)
+    window_end = datetime.combine(today + timedelta(days=1), time.min, APP_TZ)
+    saved = ItemFeedbackState.curation_action == FeedbackAction.SAVED.value
+    return {
+        "feed_lookup": select(Feed.id).where(Feed.feed_date == today, Feed.slot == SlotType.AM),
+        "feed_overlay": (
+            select(Item.id, Item.translated_title_ko, ItemFeedbackState.curation_action)
+            .outerjoin(ItemFeedbackState, ItemFeedbackState.item_id == Item.id)
+            .where(Item.id.in_([1, 2, 3]))
+        ),
+        "feed_candidates": candidate_statement(now - timedelta(hours=settings.ingestion_lookback_hours)),
+        "bookmarks_keyset": (
+            select(Item.id, Source.name, ItemFeedbackState.curation_at)
+            .join(ItemFeedbackState, ItemFeedbackState.item_id == Item.id)
+            .join(Source, Item.source_id == Source.id)
+            .where(saved, tuple_(ItemFeedbackState.curation_at, ItemFeedbackState.item_id) < (now, 2**31 - 1))
+            .order_by(ItemFeedbackState.curation_at.desc(), ItemFeedbackState.item_id.desc())
+            .limit(21)
+        ),
+        "metrics": event_metrics_statement(window_start, window_end, window_start.date(), today),
+        "keyword_sentiments": keyword_sentiment_statement(window_start, window_end, window_start.date(), today, 2, 50),
+    }
+
+
+def _seq_scans(plan: dict):
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from _seq_scans(child)
+
+
+def _large_tables(db: Session, min_rows: int) -> dict[str, float]:
+    rows = db.execute(
+        text(
+            """
+            SELECT c.relname, c.reltuples FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relkind = 'r' AND n.nspname = current_schema() AND c.reltuples >= :min_rows
+            """
+        ),
+        {"min_rows": min_rows},
+    ).all()
+    return {name: reltuples for name, reltuples in rows}
+
+
+def check_query_plans(db: Session, min_rows: int = DEFAULT_MIN_ROWS, strict: bool = False) -> list[PlanViolation]:
+    """Return seq scans on large tables (any table when ``strict``) across the hot query plans."""
+    conn = db.connection()
+    if strict:
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    # reltuples is -1 for tables never analyzed, so strict mode must not filter on it.
+    large = _large_tables(db, -1 if strict else min_rows)
+    violations = []
+    for name, stmt in _hot_queries().items():
+        compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+        raw = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar_one()
+        plan = (raw if isinstance(raw, list) else json.loads(raw))[0]["Plan"]
+        for relation in _seq_scans(plan):
+            if relation in large:
+                violations.append(PlanViolation(name, relation, large[relation]))
+    return violations
+
+
+if __name__ == "__main__":
+    from app.db import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Fail if hot queries plan sequential scans on large tables.")
+    parser.add_argument("--min-rows", type=int, default=DEFAULT_MIN_ROWS)
+    parser.add_argument("--strict", action="store_true", help="disable seq scans and check every table")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        found = check_query_plans(db, args.min_rows, strict=args.strict)
+    for v in found:
+        print(f"{v.query}: seq scan on {v.relation} (~{int(v.estimated_rows)} rows)")
+    if found:
+        sys.exit(1)
+    print("ok: no sequential scans on large tables")
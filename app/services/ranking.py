@@ -2,16 +2,59 @@ from __future__ import annotations
 
 from datetime import UTC, datetime
 
+from sqlalchemy import Float, Numeric, cast, func, literal, update
+from sqlalchemy.orm import Session
+from sqlalchemy.types import DateTime
 
-def freshness_score(published_at: datetime | None) -> float:
-    if not published_at:
+from app.models import Item, Source
+
+FRESHNESS_MAX = 1.2
+FRESHNESS_DECAY_HOURS = 48.0
+FRESHNESS_WEIGHT = 0.7
+SOURCE_WEIGHT = 0.3
+# Scores are quantized so periodic rescoring only rewrites an item when its score
+# crosses a step (every few hours of decay), not on every run.
+SCORE_STEP = 0.05
+
+
+def freshness_score(published_at: datetime | None, fetched_at: datetime | None = None) -> float:
+    # Items without a publish date decay from the time we first saw them.
+    ts = published_at or fetched_at
+    if not ts:
         return 0.2
     now = datetime.now(UTC)
-    if published_at.tzinfo is None:
-        published_at = published_at.replace(tzinfo=UTC)
-    age_hours = max((now - published_at).total_seconds() / 3600, 0)
-    return max(0.0, 1.2 - (age_hours / 48.0))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=UTC)
+    age_hours = max((now - ts).total_seconds() / 3600, 0)
+    return max(0.0, FRESHNESS_MAX - (age_hours / FRESHNESS_DECAY_HOURS))
+
+
+def compute_score(source_weight: float, published_at: datetime | None, fetched_at: datetime | None = None) -> float:
+    score = (freshness_score(published_at, fetched_at) * FRESHNESS_WEIGHT) + (source_weight * SOURCE_WEIGHT)
+    return round(round(score / SCORE_STEP) * SCORE_STEP, 4)
+
+
+def score_expression(now: datetime):
+    """SQL twin of ``compute_score`` over items joined to sources."""
+    ts = func.coalesce(Item.published_at, Item.fetched_at)
+    age_hours = func.greatest(func.extract("epoch", literal(now, DateTime(timezone=True)) - ts) / 3600.0, 0.0)
+    freshness = func.greatest(0.0, FRESHNESS_MAX - age_hours / FRESHNESS_DECAY_HOURS)
+    score = freshness * FRESHNESS_WEIGHT + Source.weight * SOURCE_WEIGHT
+    step = literal(SCORE_STEP, Numeric)
+    return cast(func.round(cast(score, Numeric) / step) * step, Float)
+
 
+def rescore_items(db: Session, since: datetime, now: datetime) -> int:
+    """Recompute scores for every item fetched since ``since`` in one UPDATE.
 
-def compute_score(source_weight: float, published_at: datetime | None) -> float:
-    return round((freshness_score(published_at) * 0.7) + (source_weight * 0.3), 4)
+    Scores are set at ingestion and would otherwise never decay. Only rows whose
+    quantized score moved are written. Does not commit; returns the rows updated.
+    """
+    new_score = score_expression(now)
+    result = db.execute(
+        update(Item)
+        .where(Item.source_id == Source.id, Item.fetched_at >= since, Item.score != new_score)
+        .values(score=new_score)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Date, Integer, cast, func, select, true, union, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import (
+    DailyEventRollup,
+    DailyFeedOpen,
+    Feedback,
+    FeedbackAction,
+    ItemEvent,
+    ItemEventType,
+    ItemKeyword,
+    KeywordFeedbackDaily,
+    RollupWatermark,
+)
+from app.services.utils import utcnow
+
+EVENT_ROLLUP = "item_events"
+KEYWORD_FEEDBACK_ROLLUP = "keyword_feedback"
+SENTIMENT_ACTIONS = [FeedbackAction.LIKED.value, FeedbackAction.DISLIKED.value]
+
+
+def _local_date(column):
+    return cast(func.timezone(settings.app_timezone, column), Date)
+
+
+def lock_watermark(db: Session, name: str) -> RollupWatermark:
+    """Fetch a watermark row FOR UPDATE, creating it at 0; serializes concurrent rollup runs."""
+    db.execute(pg_insert(RollupWatermark).values(name=name, last_id=0, updated_at=utcnow()).on_conflict_do_nothing())
+    return db.execute(select(RollupWatermark).where(RollupWatermark.name == name).with_for_update()).scalar_one()
+
+
+def watermark_subquery(name: str):
+    return func.coalesce(select(RollupWatermark.last_id).where(RollupWatermark.name == name).scalar_subquery(), 0)
+
+
+def run_event_rollup(db: Session) -> dict:
+    """Fold item events newer than the watermark into the daily rollup tables.
+
+    Events inserted less than ``ROLLUP_SETTLE_SECONDS`` ago are left for the next
+    run so an insert still in flight with a lower id is not skipped. Settling uses
+    ``inserted_at``, not ``created_at``: buffered events are stamped when queued
+    and can be written much later. Rollup rows and the new watermark are committed
+    together.
+    """
+    watermark = lock_watermark(db, EVENT_ROLLUP)
+    # Database clock, same as the inserted_at default.
+    settle_cutoff = func.now() - timedelta(seconds=settings.rollup_settle_seconds)
+    upper = db.execute(
+        select(func.max(ItemEvent.id)).where(ItemEvent.id > watermark.last_id, ItemEvent.inserted_at < settle_cutoff)
+    ).scalar_one_or_none()
+    if upper is None:
+        db.commit()
+        return {"from_id": watermark.last_id, "to_id": watermark.last_id}
+
+    in_range = (ItemEvent.id > watermark.last_id, ItemEvent.id <= upper)
+    local_date = _local_date(ItemEvent.created_at)
+    keys = (
+        local_date,
+        func.coalesce(ItemEvent.slot, ""),
+        func.coalesce(ItemEvent.category, ""),
+        func.coalesce(ItemEvent.source_id, 0),
+        ItemEvent.event_type,
+    )
+    counts = select(*keys, func.count()).where(*in_range).group_by(*keys)
+    stmt = pg_insert(DailyEventRollup).from_select(
+        ["local_date", "slot", "category", "source_id", "event_type", "event_count"], counts
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["local_date", "slot", "category", "source_id", "event_type"],
+            set_={"event_count": DailyEventRollup.event_count + stmt.excluded.event_count},
+        )
+    )
+
+    opens = (
+        select(local_date, ItemEvent.feed_id)
+        .where(*in_range, ItemEvent.event_type == ItemEventType.IMPRESSION.value, ItemEvent.feed_id.is_not(None))
+        .distinct()
+    )
+    db.execute(pg_insert(DailyFeedOpen).from_select(["local_date", "feed_id"], opens).on_conflict_do_nothing())
+
+    from_id = watermark.last_id
+    watermark.last_id = upper
+    watermark.updated_at = utcnow()
+    db.commit()
+    return {"from_id": from_id, "to_id": upper}
+
+
+def event_metrics_statement(start_dt: datetime, end_dt: datetime, from_date: date, to_date: date):
+    watermark = watermark_subquery(EVENT_ROLLUP)
+    impression = ItemEventType.IMPRESSION.value
+    click = ItemEventType.CLICK.value
+    tail_filter = (ItemEvent.id > watermark, ItemEvent.created_at >= start_dt, ItemEvent.created_at < end_dt)
+
+    rolled = (
+        select(
+            func.coalesce(func.sum(DailyEventRollup.event_count).filter(DailyEventRollup.event_type == impression), 0).label("impressions"),
+            func.coalesce(func.sum(DailyEventRollup.event_count).filter(DailyEventRollup.event_type == click), 0).label("clicks"),
+        )
+        .where(DailyEventRollup.local_date >= from_date, DailyEventRollup.local_date <= to_date)
+        .subquery()
+    )
+    tail = (
+        select(
+            func.count().filter(ItemEvent.event_type == impression).label("impressions"),
+            func.count().filter(ItemEvent.event_type == click).label("clicks"),
+        )
+        .where(*tail_filter)
+        .subquery()
+    )
+    opened_feeds = union(
+        select(DailyFeedOpen.feed_id).where(DailyFeedOpen.local_date >= from_date, DailyFeedOpen.local_date <= to_date),
+        select(ItemEvent.feed_id).where(*tail_filter, ItemEvent.event_type == impression, ItemEvent.feed_id.is_not(None)),
+    ).subquery()
+
+    return select(
+        (rolled.c.impressions + tail.c.impressions).label("impressions"),
+        (rolled.c.clicks + tail.c.clicks).label("clicks"),
+        select(func.count()).select_from(opened_feeds).scalar_subquery().label("opened_slots"),
+    ).select_from(rolled.join(tail, true()))
+
+
+def event_metrics(db: Session, start_dt: datetime, end_dt: datetime, from_date: date, to_date: date) -> dict:
+    """Impressions, clicks and opened feeds for a local date window.
+
+    Rolled-up days are summed from ``daily_event_rollups`` and events past the
+    watermark come from one raw scan of ``item_events``. Both halves read the
+    watermark inside the same statement, so a concurrent rollup run can neither
+    double count nor drop events.
+    """
+    row = db.execute(event_metrics_statement(start_dt, end_dt, from_date, to_date)).one()
+    return {"impressions": int(row.impressions), "clicks": int(row.clicks), "opened_slots": int(row.opened_slots)}
+
+
+def _fold_keyword_feedback(db: Session, *conditions) -> None:
+    local_date = _local_date(Feedback.created_at)
+    keys = (local_date, ItemKeyword.keyword, ItemKeyword.item_id)
+    counts = (
+        select(
+            *keys,
+            func.count().filter(Feedback.action == FeedbackAction.LIKED.value),
+            func.count().filter(Feedback.action == FeedbackAction.DISLIKED.value),
+        )
+        .join(ItemKeyword, ItemKeyword.item_id == Feedback.item_id)
+        .where(Feedback.action.in_(SENTIMENT_ACTIONS), *conditions)
+        .group_by(*keys)
+    )
+    stmt = pg_insert(KeywordFeedbackDaily).from_select(
+        ["local_date", "keyword", "item_id", "liked_count", "disliked_count"], counts
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["local_date", "keyword", "item_id"],
+            set_={
+                "liked_count": KeywordFeedbackDaily.liked_count + stmt.excluded.liked_count,
+                "disliked_count": KeywordFeedbackDaily.disliked_count + stmt.excluded.disliked_count,
+            },
+        )
+    )
+
+
+def run_keyword_feedback_rollup(db: Session) -> dict:
+    """Fold liked/disliked feedback newer than the watermark into keyword_feedback_daily."""
+    watermark = lock_watermark(db, KEYWORD_FEEDBACK_ROLLUP)
+    # Database clock, same as the inserted_at default.
+    settle_cutoff = func.now() - timedelta(seconds=settings.rollup_settle_seconds)
+    upper = db.execute(
+        select(func.max(Feedback.id)).where(Feedback.id > watermark.last_id, Feedback.inserted_at < settle_cutoff)
+    ).scalar_one_or_none()
+    if upper is None:
+        db.commit()
+        return {"from_id": watermark.last_id, "to_id": watermark.last_id}
+
+    _fold_keyword_feedback(db, Feedback.id > watermark.last_id, Feedback.id <= upper)
+    from_id = watermark.last_id
+    watermark.last_id = upper
+    watermark.updated_at = utcnow()
+    db.commit()
+    return {"from_id": from_id, "to_id": upper}
+
+
+def fold_keyword_feedback_for_items(db: Session, item_ids: list[int]) -> None:
+    """Add already-rolled-up feedback for items whose keywords were just inserted.
+
+    Used by the keyword backfill: feedback up to the watermark was folded while
+    these items had no keywords. Runs in the caller's transaction, which holds
+    the watermark lock until it commits.
+    """
+    if not item_ids:
+        return
+    watermark = lock_watermark(db, KEYWORD_FEEDBACK_ROLLUP)
+    if watermark.last_id:
+        _fold_keyword_feedback(db, Feedback.id <= watermark.last_id, Feedback.item_id.in_(item_ids))
+
+
+def keyword_sentiment_statement(
+    start_dt: datetime,
+    end_dt: datetime,
+    from_date: date,
+    to_date: date,
+    min_feedback: int,
+    limit: int,
+):
+    watermark = watermark_subquery(KEYWORD_FEEDBACK_ROLLUP)
+    rolled = select(
+        KeywordFeedbackDaily.keyword,
+        KeywordFeedbackDaily.item_id,
+        KeywordFeedbackDaily.liked_count,
+        KeywordFeedbackDaily.disliked_count,
+    ).where(KeywordFeedbackDaily.local_date >= from_date, KeywordFeedbackDaily.local_date <= to_date)
+    tail = (
+        select(
+            ItemKeyword.keyword,
+            ItemKeyword.item_id,
+            func.count().filter(Feedback.action == FeedbackAction.LIKED.value),
+            func.count().filter(Feedback.action == FeedbackAction.DISLIKED.value),
+        )
+        .join(ItemKeyword, ItemKeyword.item_id == Feedback.item_id)
+        .where(
+            Feedback.id > watermark,
+            Feedback.action.in_(SENTIMENT_ACTIONS),
+            Feedback.created_at >= start_dt,
+            Feedback.created_at < end_dt,
+        )
+        .group_by(ItemKeyword.keyword, ItemKeyword.item_id)
+    )
+    combined = union_all(rolled, tail).subquery()
+
+    liked_count = func.sum(combined.c.liked_count)
+    disliked_count = func.sum(combined.c.disliked_count)
+    total_feedback = liked_count + disliked_count
+    return (
+        select(
+            combined.c.keyword,
+            cast(liked_count, Integer).label("liked_count"),
+            cast(disliked_count, Integer).label("disliked_count"),
+            func.count(func.distinct(combined.c.item_id)).label("total_items"),
+            cast(total_feedback, Integer).label("total_feedback"),
+        )
+        .group_by(combined.c.keyword)
+        .having(total_feedback >= min_feedback)
+        .order_by(total_feedback.desc())
+        .limit(limit)
+    )
+
+
+def keyword_sentiment_rows(
+    db: Session,
+    start_dt: datetime,
+    end_dt: datetime,
+    from_date: date,
+    to_date: date,
+    min_feedback: int,
+    limit: int,
+):
+    """Per-keyword liked/disliked/item counts for a local date window.
+
+    Same result as grouping ``item_keywords JOIN feedback`` over the window, but
+    rolled-up days come from ``keyword_feedback_daily`` and only feedback past the
+    watermark is joined live.
+    """
+    return db.execute(keyword_sentiment_statement(start_dt, end_dt, from_date, to_date, min_feedback, limit)).all()
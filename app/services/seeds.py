@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import select, text
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models import Source, SourceType
@@ -62,88 +62,6 @@ DEFAULT_SOURCES: list[dict] = [
 ]
 
 
-def apply_schema_upgrades(session: Session) -> None:
-    # Lightweight migration path without Alembic.
-    session.execute(
-        text("ALTER TABLE sources ADD COLUMN IF NOT EXISTS category VARCHAR(64) NOT NULL DEFAULT 'general'")
-    )
-    session.execute(
-        text("ALTER TABLE items ADD COLUMN IF NOT EXISTS translated_title_ko VARCHAR(512)")
-    )
-    session.execute(
-        text(
-            """
-            DO $$
-            BEGIN
-                IF EXISTS (
-                    SELECT 1
-                    FROM information_schema.columns
-                    WHERE table_name = 'feedback'
-                      AND column_name = 'action'
-                      AND data_type = 'USER-DEFINED'
-                ) THEN
-                    ALTER TABLE feedback
-                    ALTER COLUMN action TYPE VARCHAR(32)
-                    USING action::text;
-                END IF;
-            END $$;
-            """
-        )
-    )
-    session.execute(text("ALTER TABLE feedback ADD COLUMN IF NOT EXISTS slot VARCHAR(8)"))
-    session.execute(text("ALTER TABLE feedback ADD COLUMN IF NOT EXISTS rank INTEGER"))
-    session.execute(text("ALTER TABLE feedback ADD COLUMN IF NOT EXISTS source_id INTEGER"))
-    session.execute(text("ALTER TABLE feedback ADD COLUMN IF NOT EXISTS category VARCHAR(64)"))
-    session.execute(text("ALTER TABLE feedback ADD COLUMN IF NOT EXISTS feed_id INTEGER"))
-    # Normalize historical enum-name rows (e.g. SAVED/SKIPPED) to lowercase values.
-    session.execute(text("UPDATE feedback SET action = lower(action) WHERE action <> lower(action)"))
-    session.execute(
-        text(
-            """
-            CREATE TABLE IF NOT EXISTS item_events (
-                id SERIAL PRIMARY KEY,
-                item_id INTEGER NOT NULL REFERENCES items(id),
-                event_type VARCHAR(32) NOT NULL,
-                slot VARCHAR(8),
-                rank INTEGER,
-                source_id INTEGER REFERENCES sources(id),
-                category VARCHAR(64),
-                feed_id INTEGER REFERENCES feeds(id),
-                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
-            )
-            """
-        )
-    )
-    session.execute(
-        text(
-            "CREATE INDEX IF NOT EXISTS idx_item_events_type_created_at ON item_events(event_type, created_at)"
-        )
-    )
-    # Phase 2: summary field for keyword extraction
-    session.execute(text("ALTER TABLE items ADD COLUMN IF NOT EXISTS summary TEXT"))
-    # Phase 2: item_keywords table for keyword sentiment analysis
-    session.execute(
-        text(
-            """
-            CREATE TABLE IF NOT EXISTS item_keywords (
-                id SERIAL PRIMARY KEY,
-                item_id INTEGER NOT NULL REFERENCES items(id),
-                keyword VARCHAR(128) NOT NULL,
-                relevance_score FLOAT NOT NULL DEFAULT 0.0,
-                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
-            )
-            """
-        )
-    )
-    session.execute(
-        text("CREATE INDEX IF NOT EXISTS idx_item_keywords_keyword ON item_keywords(keyword)")
-    )
-    session.execute(
-        text("CREATE INDEX IF NOT EXISTS idx_item_keywords_item_id ON item_keywords(item_id)")
-    )
-    session.commit()
-
-
 def sync_seed_sources(session: Session) -> dict:
     existing = {x.url: x for x in session.execute(select(Source)).scalars().all()}
     created = 0
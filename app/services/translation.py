@@ -1,20 +1,106 @@
 from __future__ import annotations
 
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
 import httpx
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
 
 from app.config import settings
+from app.models import TranslationCache
+from app.services.utils import title_key
 
+logger = logging.getLogger(__name__)
+
+# DeepL accepts at most 50 text values per translate request.
+DEEPL_MAX_TEXTS_PER_REQUEST = 50
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``acquire`` blocks until a token is available."""
+
+    def __init__(self, rate_per_second: float, capacity: int):
+        self.rate = max(rate_per_second, 0.001)
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Stops calls for ``cooldown_seconds`` after ``failure_threshold`` consecutive failures.
+
+    Once the cooldown has passed a single trial call is let through; success
+    closes the breaker, failure re-opens it for another cooldown.
+    """
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_in_flight or time.monotonic() - self._opened_at < self.cooldown_seconds:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning("deepl circuit opened after %s consecutive failures", self._failures)
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+deepl_rate_limiter = TokenBucket(settings.deepl_rate_limit_per_second, settings.deepl_rate_limit_burst)
+deepl_breaker = CircuitBreaker(settings.deepl_breaker_failure_threshold, settings.deepl_breaker_cooldown_seconds)
 
-def translate_title_to_korean(title: str) -> str | None:
-    api_key = settings.deepl_api_key.strip()
-    if not api_key:
-        return None
 
+def _request_translations(texts: list[str]) -> list[str | None] | None:
+    """Translate one chunk; None means it was never sent because the breaker is open."""
+    api_key = settings.deepl_api_key.strip()
     headers = {"Authorization": f"DeepL-Auth-Key {api_key}"}
-    payload = {"text": [title], "target_lang": "KO"}
+    payload = {"text": texts, "target_lang": "KO"}
     attempts = max(1, settings.deepl_retries + 1)
 
-    for _ in range(attempts):
+    for attempt in range(attempts):
+        if not deepl_breaker.allow():
+            if attempt == 0:
+                return None
+            break
+        deepl_rate_limiter.acquire()
         try:
             response = httpx.post(
                 settings.deepl_api_url,
@@ -23,15 +109,80 @@ def translate_title_to_korean(title: str) -> str | None:
                 timeout=settings.deepl_timeout_seconds,
             )
             response.raise_for_status()
-            data = response.json()
-            translations = data.get("translations", [])
-            if not translations:
-                return None
-            text = translations[0].get("text")
-            if not text:
-                return None
-            return str(text)
+            translations = response.json().get("translations", [])
         except Exception:
+            deepl_breaker.record_failure()
+            continue
+        deepl_breaker.record_success()
+        if len(translations) != len(texts):
+            return [None] * len(texts)
+        return [str(t["text"]) if t.get("text") else None for t in translations]
+
+    return [None] * len(texts)
+
+
+def translate_titles_to_korean(
+    db: Session,
+    titles: list[str],
+    stats: Counter | None = None,
+    concurrency: int = 1,
+    deferred: set[str] | None = None,
+) -> list[str | None]:
+    """Translate titles to Korean, returning results in input order.
+
+    Titles are looked up in ``translation_cache`` by ``title_key`` first; the
+    misses are sent to DeepL in batches (up to ``concurrency`` requests in
+    flight, subject to the shared rate limiter and circuit breaker) and
+    successful translations are cached. Untranslated titles come back as None.
+    ``stats`` (if given) receives ``cache_hits`` / ``cache_misses`` counts.
+    ``deferred`` (if given) receives the ``title_key`` of every title that was
+    not sent because the circuit breaker was open, as opposed to titles DeepL
+    was asked for and failed on.
+    """
+    if not titles or not settings.deepl_api_key.strip():
+        return [None] * len(titles)
+
+    keys = [title_key(t) for t in titles]
+    cached: dict[str, str] = dict(
+        db.execute(
+            select(TranslationCache.title_key, TranslationCache.translated_text)
+            .where(TranslationCache.title_key.in_(set(keys)))
+        ).all()
+    )
+
+    misses: dict[str, str] = {}
+    for key, title in zip(keys, titles):
+        if key not in cached and key not in misses:
+            misses[key] = title
+    if stats is not None:
+        stats["cache_hits"] += sum(1 for key in keys if key in cached)
+        stats["cache_misses"] += len(misses)
+
+    pending = list(misses.items())
+    batch_size = max(1, min(settings.deepl_batch_size, DEEPL_MAX_TEXTS_PER_REQUEST))
+    chunks = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+    if concurrency > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks)), thread_name_prefix="deepl") as pool:
+            results = list(pool.map(lambda chunk: _request_translations([title for _, title in chunk]), chunks))
+    else:
+        results = [_request_translations([title for _, title in chunk]) for chunk in chunks]
+
+    new_rows = []
+    for chunk, texts in zip(chunks, results):
+        if texts is None:
+            if deferred is not None:
+                deferred.update(key for key, _ in chunk)
+            if stats is not None:
+                stats["deferred"] += len(chunk)
             continue
+        for (key, _), text in zip(chunk, texts):
+            if not text:
+                continue
+            text = text[:512]
+            cached[key] = text
+            new_rows.append({"title_key": key, "translated_text": text})
+
+    if new_rows:
+        db.execute(pg_insert(TranslationCache).values(new_rows).on_conflict_do_nothing(index_elements=["title_key"]))
 
-    return None
+    return [cached.get(key) for key in keys]
@@ -19,6 +19,10 @@ def canonicalize_url(raw: str) -> str:
     return urlunparse(clean)
 
 
+def url_domain(url: str) -> str:
+    return urlparse(url).netloc
+
+
 def detect_language(title: str) -> str:
     if re.search(r"[\uac00-\ud7af]", title):
         return "ko"
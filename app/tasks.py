@@ -1,3 +1,5 @@
+import functools
+import logging
 from zoneinfo import ZoneInfo
 
 from apscheduler.schedulers.background import BackgroundScheduler
@@ -6,23 +8,69 @@ from apscheduler.triggers.cron import CronTrigger
 from app.config import settings
 from app.db import SessionLocal
 from app.models import SlotType
+from app.services.enrichment import run_translation_enrichment
 from app.services.feed_builder import generate_feed_for_slot
+from app.services.fetch_queue import sync_fetch_queue
 from app.services.ingestion import run_ingestion
+from app.services.leader import scheduler_leader
+from app.services.rollups import run_event_rollup, run_keyword_feedback_rollup
 
 scheduler = BackgroundScheduler(timezone=ZoneInfo(settings.app_timezone))
 APP_TZ = ZoneInfo(settings.app_timezone)
+logger = logging.getLogger(__name__)
 
 
+def _leader_only(job):
+    # Every worker process runs a scheduler; only the advisory-lock holder does the work.
+    @functools.wraps(job)
+    def wrapper(*args, **kwargs):
+        if not scheduler_leader.is_leader():
+            return None
+        return job(*args, **kwargs)
+
+    return wrapper
+
+
+def _leader_heartbeat_job():
+    try:
+        scheduler_leader.is_leader()
+    except Exception:
+        logger.warning("scheduler leader election failed", exc_info=True)
+
+
+@_leader_only
 def _ingest_job():
     with SessionLocal() as db:
+        if settings.ingestion_use_fetch_queue:
+            # Fetch workers (python -m app.worker) do the fetching; just keep the queue in sync.
+            sync_fetch_queue(db)
+            return
         run_ingestion(db)
+    # Translate the new items right away instead of waiting for the next interval.
+    if scheduler.running:
+        scheduler.add_job(_translation_job, id="translation_enrichment_now", replace_existing=True)
 
 
+@_leader_only
+def _translation_job():
+    with SessionLocal() as db:
+        run_translation_enrichment(db)
+
+
+@_leader_only
 def _feed_job(slot: SlotType):
     with SessionLocal() as db:
         generate_feed_for_slot(db, slot)
 
 
+@_leader_only
+def _rollup_job():
+    with SessionLocal() as db:
+        run_event_rollup(db)
+        run_keyword_feedback_rollup(db)
+
+
+@_leader_only
 def _hourly_refresh_job():
     # Refresh both slots hourly from the latest ingested item pool.
     with SessionLocal() as db:
@@ -35,7 +83,28 @@ def start_scheduler():
     if scheduler.running:
         return
 
+    scheduler.add_job(
+        _leader_heartbeat_job,
+        "interval",
+        seconds=settings.scheduler_leader_heartbeat_seconds,
+        id="scheduler_leader_heartbeat",
+        replace_existing=True,
+    )
     scheduler.add_job(_ingest_job, "interval", minutes=30, id="ingestion_30m", replace_existing=True)
+    scheduler.add_job(
+        _translation_job,
+        "interval",
+        seconds=settings.translation_enrichment_interval_seconds,
+        id="translation_enrichment",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        _rollup_job,
+        "interval",
+        minutes=settings.rollup_interval_minutes,
+        id="event_rollup",
+        replace_existing=True,
+    )
     scheduler.add_job(
         _hourly_refresh_job,
         CronTrigger(minute=5, timezone=APP_TZ),
@@ -47,4 +116,6 @@ def start_scheduler():
 
 def stop_scheduler():
     if scheduler.running:
-        scheduler.shutdown(wait=False)
+        # Let running jobs finish before another replica can take leadership.
+        scheduler.shutdown(wait=True)
+    scheduler_leader.release()
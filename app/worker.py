@@ -0,0 +1,59 @@
+"""Source fetch worker: ``python -m app.worker``.
+
+Run as many copies as needed (processes, containers); they coordinate only
+through ``source_fetch_queue``. Requires the API to have run migrations first.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+import uuid
+
+from app.config import settings
+from app.db import SessionLocal
+from app.services.fetch_queue import claim_sources, process_claimed_sources, sync_fetch_queue
+from app.services.keywords import shutdown_keyword_pool
+
+logger = logging.getLogger("app.worker")
+
+
+def run_worker(stop: threading.Event) -> None:
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    logger.info("fetch worker %s started", worker_id)
+    next_sync = 0.0
+    while not stop.is_set():
+        try:
+            with SessionLocal() as db:
+                # The scheduler leader also syncs; workers only pick up new sources
+                # now and then instead of running the INSERT ... SELECT every round.
+                if time.monotonic() >= next_sync:
+                    sync_fetch_queue(db)
+                    next_sync = time.monotonic() + settings.source_fetch_queue_sync_seconds
+                source_ids = claim_sources(db, worker_id, max(1, settings.source_fetch_claim_batch))
+                if source_ids:
+                    stats = process_claimed_sources(db, worker_id, source_ids)
+                    logger.info("fetch worker %s: %s", worker_id, stats)
+                    continue
+        except Exception:
+            logger.exception("fetch worker iteration failed")
+        stop.wait(settings.source_fetch_idle_sleep_seconds)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    try:
+        run_worker(stop)
+    finally:
+        shutdown_keyword_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Pins the number of SQL statements feed generation may run.
+
+Feed generation works on projected candidate tuples: the statement count must
+not grow with the number of items, sources or picked feed entries.
+"""
+
+import pytest
+
+# job insert, rescore, preference refresh, fingerprint, existing feed lookup,
+# feed insert, candidates, preference refresh + item keywords, current
+# feed_items + bulk insert, feed + job updates at commit, feed context publish.
+FRESH_GENERATION_STATEMENTS = 14
+# job insert, rescore, preference refresh, fingerprint, existing feed lookup,
+# job update at commit.
+UNCHANGED_REFRESH_STATEMENTS = 6
+
+
+@pytest.fixture
+def statements(engine):
+    from sqlalchemy import event
+
+    recorded: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield recorded
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture(autouse=True)
+def fresh_preferences(monkeypatch):
+    pytest.importorskip("numpy")
+    from app.services import feed_builder, personalization
+
+    preferences = personalization.KeywordPreferences()
+    monkeypatch.setattr(personalization, "keyword_preferences", preferences)
+    monkeypatch.setattr(feed_builder, "keyword_preferences", preferences)
+
+
+def _seed(db, per_source: int):
+    from app.models import Item, Source, SourceType
+    from app.services.ranking import compute_score
+    from app.services.utils import url_domain, utcnow
+
+    now = utcnow()
+    for s_idx, category in enumerate(["ai", "devtools", "world-economy"]):
+        source = Source(
+            type=SourceType.RSS,
+            name=f"Source {s_idx}",
+            url=f"https://feeds{s_idx}.example.com/rss",
+            category=category,
+            weight=1.0,
+        )
+        db.add(source)
+        db.flush()
+        for i in range(per_source):
+            url = f"https://site{s_idx}-{i % 5}.example.com/post/{i}"
+            db.add(
+                Item(
+                    source_id=source.id,
+                    canonical_url=url,
+                    url=url,
+                    domain=url_domain(url),
+                    title=f"Story {s_idx}-{i}",
+                    dedupe_key=f"{s_idx}-{i}",
+                    published_at=now,
+                    fetched_at=now,
+                    score=compute_score(source.weight, now, now),
+                )
+            )
+    db.commit()
+
+
+@pytest.mark.parametrize("per_source", [5, 60])
+def test_feed_generation_statement_budget(db, statements, per_source):
+    from app.models import FeedItem, SlotType
+    from app.services.feed_builder import generate_feed_for_slot
+
+    _seed(db, per_source)
+
+    statements.clear()
+    feed_id = generate_feed_for_slot(db, SlotType.AM)
+    assert len(statements) == FRESH_GENERATION_STATEMENTS, statements
+    assert db.query(FeedItem).filter(FeedItem.feed_id == feed_id).count() > 0
+
+    statements.clear()
+    assert generate_feed_for_slot(db, SlotType.AM) == feed_id
+    assert len(statements) == UNCHANGED_REFRESH_STATEMENTS, statements
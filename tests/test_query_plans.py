@@ -0,0 +1,5 @@
+def test_hot_queries_use_indexes(db):
+    from app.services.query_plans import check_query_plans
+
+    violations = check_query_plans(db, strict=True)
+    assert violations == [], [f"{v.query}: seq scan on {v.relation}" for v in violations]
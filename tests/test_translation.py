@@ -0,0 +1,68 @@
+"""translate_titles_to_korean against a fake DeepL endpoint (httpx.MockTransport)."""
+
+from collections import Counter
+from urllib.parse import parse_qs
+
+import pytest
+
+
+@pytest.fixture
+def deepl(monkeypatch):
+    """Route DeepL calls to an in-process fake; returns the list of requested text batches."""
+    httpx = pytest.importorskip("httpx")
+    from app.config import settings
+    from app.services import translation
+
+    requests: list[list[str]] = []
+
+    def handler(request):
+        texts = parse_qs(request.content.decode())["text"]
+        requests.append(texts)
+        return httpx.Response(200, json={"translations": [{"text": f"ko:{text}"} for text in texts]})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(translation.httpx, "post", client.post)
+    monkeypatch.setattr(settings, "deepl_api_key", "test-key")
+    monkeypatch.setattr(settings, "deepl_api_url", "http://deepl.test/v2/translate")
+    monkeypatch.setattr(settings, "deepl_batch_size", 2)
+    monkeypatch.setattr(translation, "deepl_rate_limiter", translation.TokenBucket(1000.0, 1000))
+    monkeypatch.setattr(translation, "deepl_breaker", translation.CircuitBreaker(5, 300.0))
+    yield requests
+    client.close()
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_chunks_at_batch_size_and_keeps_input_order(db, deepl, concurrency):
+    from app.services.translation import translate_titles_to_korean
+
+    titles = [f"Title {i}" for i in range(5)]
+    result = translate_titles_to_korean(db, titles, concurrency=concurrency)
+
+    assert result == [f"ko:{title}" for title in titles]
+    assert sorted(len(batch) for batch in deepl) == [1, 2, 2]
+    assert sorted(text for batch in deepl for text in batch) == titles
+
+
+def test_duplicate_titles_are_translated_once(db, deepl):
+    from app.services.translation import translate_titles_to_korean
+
+    stats: Counter = Counter()
+    result = translate_titles_to_korean(db, ["Alpha", "Beta", "Alpha"], stats)
+
+    assert result == ["ko:Alpha", "ko:Beta", "ko:Alpha"]
+    assert deepl == [["Alpha", "Beta"]]
+    assert stats["cache_misses"] == 2
+
+
+def test_cache_hits_skip_deepl_on_later_calls(db, deepl):
+    from app.services.translation import translate_titles_to_korean
+
+    first: Counter = Counter()
+    assert translate_titles_to_korean(db, ["Alpha", "Beta"], first) == ["ko:Alpha", "ko:Beta"]
+    db.commit()
+    assert (first["cache_hits"], first["cache_misses"]) == (0, 2)
+
+    second: Counter = Counter()
+    assert translate_titles_to_korean(db, ["Beta", "Gamma"], second) == ["ko:Beta", "ko:Gamma"]
+    assert (second["cache_hits"], second["cache_misses"]) == (1, 1)
+    assert deepl == [["Alpha", "Beta"], ["Gamma"]]